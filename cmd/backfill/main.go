@@ -5,25 +5,86 @@ import (
 	"flag"
 	"fmt"
 	"os"
+	"strings"
+	"time-series-rag-agent/config"
+	"time-series-rag-agent/internal/exchange"
 	"time-series-rag-agent/internal/pipeline"
+	"time-series-rag-agent/internal/storage/postgresql"
 	"time-series-rag-agent/pkg/logger"
+
+	"golang.org/x/sync/errgroup"
 )
 
 func main() {
-	symbol := flag.String("symbol", "BTCUSDT", "trading pair symbol (e.g. BTCUSDT)")
-	interval := flag.String("interval", "15m", "candle interval (e.g. 15m, 1h)")
+	symbols := flag.String("symbol", "BTCUSDT", "comma-separated trading pair symbols (e.g. BTCUSDT,ETHUSDT)")
+	intervals := flag.String("interval", "15m", "comma-separated candle intervals (e.g. 1h,15m)")
 	vectorWindow := flag.Int("vector-window", 30, "embedding vector window size")
 	fetchLimit := flag.Int("fetch-limit", 2000, "max candles per REST request")
 	dayLookback := flag.Int("days", 1000, "number of days to look back")
+	concurrency := flag.Int("concurrency", 3, "max symbol/interval pairs backfilled at once")
 	flag.Parse()
 
 	logger := logger.SetupLogger()
 	ctx := context.Background()
+	cfg := config.LoadConfig()
+
+	// One pool for the whole run; pgx caches prepared statements per connection,
+	// so repeated batch upserts skip parse/plan after the first call.
+	db, err := postgresql.NewPostgresDB(ctx, pipeline.DBConnString(cfg.Database), *logger)
+	if err != nil {
+		logger.Error(fmt.Sprintf("[Backfill] DB connection: %v", err))
+		os.Exit(1)
+	}
+	defer db.Close()
+
+	if err := db.EnsureLookupIndex(ctx); err != nil {
+		logger.Error(fmt.Sprintf("[Backfill] lookup index: %v", err))
+		db.Close()
+		os.Exit(1)
+	}
+
+	// Run every (interval, symbol) pair in this process instead of one
+	// `go run` per pair, fanning out up to -concurrency pairs at a time so
+	// REST fetch of one symbol overlaps with DB writes of another. All pairs
+	// draw on one request-weight limiter, so more pairs do not mean more
+	// requests per minute against the shared IP budget.
+	limiter := exchange.NewWeightLimiter(exchange.FuturesWeightPerMinute)
+	g, gctx := errgroup.WithContext(ctx)
+	g.SetLimit(*concurrency)
 
-	logger.Info(fmt.Sprintf("[Backfill] symbol=%s interval=%s days=%d", *symbol, *interval, *dayLookback))
+	for _, interval := range splitList(*intervals) {
+		for _, symbol := range splitList(*symbols) {
+			g.Go(func() error {
+				logger.Info(fmt.Sprintf("[Backfill] symbol=%s interval=%s days=%d", symbol, interval, *dayLookback))
 
-	if err := pipeline.NewBackfillPipeline(ctx, logger, *symbol, *interval, *fetchLimit, *vectorWindow, *dayLookback); err != nil {
+				if err := pipeline.NewBackfillPipeline(gctx, logger, db, limiter, symbol, interval, *fetchLimit, *vectorWindow, *dayLookback); err != nil {
+					return fmt.Errorf("symbol=%s interval=%s: %w", symbol, interval, err)
+				}
+				return nil
+			})
+		}
+	}
+
+	if err := g.Wait(); err != nil {
 		logger.Error(fmt.Sprintf("Backfill failed: %v", err))
+		db.Close()
+		os.Exit(1)
+	}
+
+	if err := db.EnsureVectorIndex(ctx, *vectorWindow, splitList(*symbols), splitList(*intervals)); err != nil {
+		logger.Error(fmt.Sprintf("[Backfill] vector index: %v", err))
+		db.Close()
 		os.Exit(1)
 	}
+	logger.Info("[Backfill] HNSW vector index ready")
+}
+
+func splitList(s string) []string {
+	var out []string
+	for _, v := range strings.Split(s, ",") {
+		if v = strings.TrimSpace(v); v != "" {
+			out = append(out, v)
+		}
+	}
+	return out
 }
@@ -5,11 +5,13 @@ import (
 	"fmt"
 	"os"
 	"os/signal"
+	"sync"
 	"sync/atomic"
 	"syscall"
 	"time-series-rag-agent/config"
 	"time-series-rag-agent/internal/exchange"
 	"time-series-rag-agent/internal/pipeline"
+	"time-series-rag-agent/internal/storage/postgresql"
 	"time-series-rag-agent/pkg/logger"
 	pkg "time-series-rag-agent/pkg/notifier"
 )
@@ -30,6 +32,7 @@ func main() {
 	logger.Info(fmt.Sprintf("[Entrypoint] leverage: %d", cfg.Agent.Leverage))
 
 	discord := pkg.NewDiscordClient(cfg.Discord.DISCORD_NOTIFY_WEBHOOK_URL, cfg.Discord.DISCORD_NOTIFY_WEBHOOK_URL)
+	defer discord.Close()
 
 	binanceClient, err := exchange.NewBinanceClient(context.Background(), cfg)
 	if err != nil {
@@ -43,7 +46,18 @@ func main() {
 	ctx, cancel := signal.NotifyContext(context.Background(), os.Interrupt, syscall.SIGTERM)
 	defer cancel()
 
+	// One pool for the whole process; every bar borrows from it.
+	db, err := postgresql.NewPostgresDB(ctx, pipeline.DBConnString(cfg.Database), *logger)
+	if err != nil {
+		logger.Error(fmt.Sprintf("[Entrypoint] Error at DB connect: %v", err))
+		return
+	}
+	defer db.Close()
+
 	var pipelineRunning atomic.Int32
+	// Tracks the per-bar pipeline goroutines so shutdown waits for an
+	// in-flight bar before the deferred db/discord Close calls run.
+	var pipelines sync.WaitGroup
 
 	exchange.StartMultiSymbolKlineWebsocket(ctx, adapter, SYMBOLS, INTERVAL, logger, func(candles map[string]exchange.WsCandle) {
 		if !pipelineRunning.CompareAndSwap(0, 1) {
@@ -51,10 +65,12 @@ func main() {
 			return
 		}
 
+		pipelines.Add(1)
 		go func() {
+			defer pipelines.Done()
 			defer pipelineRunning.Store(0)
 
-			winner, winnerCandle, ok := pipeline.SelectBestOpportunity(
+			winner, winnerCandle, winnerRest, ok := pipeline.SelectBestOpportunity(
 				ctx, adapter, candles, SYMBOLS, INTERVAL, VECTOR_SIZE, cfg.LLM.PrefilterThreshold,
 			)
 			if !ok {
@@ -64,8 +80,8 @@ func main() {
 			logger.Info("[Entrypoint] selected winner", "symbol", winner, "close", winnerCandle.Close)
 
 			hooks := discord.NewPipelineHooks(winner, INTERVAL)
-			if err := pipeline.NewLivePipeline(ctx, logger, binanceClient, hooks,
-				[]exchange.WsCandle{winnerCandle}, winner, INTERVAL, VECTOR_SIZE, winnerCandle.Close,
+			if err := pipeline.NewLivePipeline(ctx, logger, binanceClient, hooks, db,
+				[]exchange.WsCandle{winnerCandle}, winnerRest, winner, INTERVAL, VECTOR_SIZE, winnerCandle.Close,
 			); err != nil {
 				logger.Error(fmt.Sprintf("[Entrypoint] Live pipeline error: %v", err))
 				return
@@ -74,5 +90,6 @@ func main() {
 		}()
 	})
 
+	pipelines.Wait()
 	logger.Info("shutdown complete")
 }
@@ -1,7 +1,11 @@
 package main
 
 import (
+	"context"
+	"time-series-rag-agent/config"
+	"time-series-rag-agent/internal/exchange"
 	"time-series-rag-agent/internal/pipeline"
+	"time-series-rag-agent/internal/storage/postgresql"
 	"time-series-rag-agent/pkg/logger"
 )
 
@@ -12,13 +16,29 @@ const (
 
 func main() {
 	logger := logger.SetupLogger()
+	ctx := context.Background()
+	cfg := config.LoadConfig()
 
-	err1Minute := pipeline.RestIngestVectorFlow(logger, symbol, "1m", vectorSize)
+	binanceClient, err := exchange.NewBinanceClient(ctx, cfg)
+	if err != nil {
+		logger.Error("[Error] Binance client", "err", err)
+		return
+	}
+	adapter := exchange.NewBinanceAdapter(binanceClient)
+
+	db, err := postgresql.NewPostgresDB(ctx, pipeline.DBConnString(cfg.Database), *logger)
+	if err != nil {
+		logger.Error("[Error] DB connect", "err", err)
+		return
+	}
+	defer db.Close()
+
+	err1Minute := pipeline.RestIngestVectorFlow(ctx, logger, adapter, db, symbol, "1m", vectorSize)
 	if err1Minute != nil {
 		logger.Error("[Error] Tested error")
 	}
 
-	err1Hour := pipeline.RestIngestVectorFlow(logger, symbol, "1h", vectorSize)
+	err1Hour := pipeline.RestIngestVectorFlow(ctx, logger, adapter, db, symbol, "1h", vectorSize)
 	if err1Hour != nil {
 		logger.Error("[Error] Tested error")
 	}
@@ -7,6 +7,8 @@ import (
 	"log"
 	"os"
 	"strconv"
+	"sync"
+	"time"
 
 	"github.com/aws/aws-sdk-go-v2/aws"
 	"github.com/aws/aws-sdk-go-v2/config"
@@ -141,7 +143,7 @@ func LoadConfig() *AppConfig {
 	// 2. Fetch Secrets from AWS to overwrite sensitive fields
 	secretName := os.Getenv("AWS_SECRET_NAME")
 	if secretName != "" {
-		secrets, err := fetchAwsSecrets(secretName)
+		secrets, err := getAwsSecrets(secretName)
 		if err != nil {
 			log.Printf("Warning: could not fetch AWS secret '%s' (falling back to env vars): %v", secretName, err)
 		} else {
@@ -168,6 +170,38 @@ func LoadConfig() *AppConfig {
 	return cfg
 }
 
+// secretCacheTTL bounds how long a fetched secret is reused before
+// LoadConfig goes back to Secrets Manager (picks up rotated credentials).
+const secretCacheTTL = time.Hour
+
+var secretCache struct {
+	mu        sync.Mutex
+	name      string
+	data      AwsSecretData
+	fetchedAt time.Time
+}
+
+// getAwsSecrets returns the cached secret when it is still fresh, otherwise
+// fetches it once and caches it for the process. LoadConfig is called many
+// times per trading cycle, so without this every call paid a Secrets Manager RTT.
+func getAwsSecrets(secretName string) (AwsSecretData, error) {
+	secretCache.mu.Lock()
+	defer secretCache.mu.Unlock()
+
+	if secretCache.name == secretName && time.Since(secretCache.fetchedAt) < secretCacheTTL {
+		return secretCache.data, nil
+	}
+
+	data, err := fetchAwsSecrets(secretName)
+	if err != nil {
+		return AwsSecretData{}, err
+	}
+	secretCache.name = secretName
+	secretCache.data = data
+	secretCache.fetchedAt = time.Now()
+	return data, nil
+}
+
 func fetchAwsSecrets(secretName string) (AwsSecretData, error) {
 	awsCfg, err := config.LoadDefaultConfig(context.TODO())
 	if err != nil {
@@ -1,7 +1,7 @@
 package embedding
 
 import (
-	"fmt"
+	"math"
 	"time"
 	"time-series-rag-agent/internal/exchange"
 )
@@ -36,13 +36,22 @@ func (f *FeatureCalculator) Calculate(history []exchange.WsRestCandle) *PatternF
 
 	window := history[len(history)-reqLen:]
 
-	closes := make([]float64, len(window))
-	for i, d := range window {
-		closes[i] = d.Close
+	// Log returns are written straight into the embedding buffer while their
+	// mean/variance accumulate (Welford), then normalized in place: one
+	// allocation, one log per return, two passes in total.
+	embedding := make([]float64, f.VectorWindow)
+	mean, m2 := 0.0, 0.0
+	for i := 1; i < len(window); i++ {
+		v := logReturn(window[i-1].Close, window[i].Close)
+		embedding[i-1] = v
+		d := v - mean
+		mean += d / float64(i)
+		m2 += d * (v - mean)
+	}
+	inv := 1 / (math.Sqrt(m2/float64(f.VectorWindow)) + PlanckConstant)
+	for i, v := range embedding {
+		embedding[i] = (v - mean) * inv
 	}
-
-	logReturns := CalculateLogReturn(closes)
-	embedding := CalculateZScore(logReturns)
 	lastCandle := window[len(window)-1]
 
 	return &PatternFeature{
@@ -54,56 +63,45 @@ func (f *FeatureCalculator) Calculate(history []exchange.WsRestCandle) *PatternF
 	}
 }
 
-func (f *FeatureCalculator) CalculateRest(history []exchange.RestCandle) *PatternFeature {
-	reqLen := f.VectorWindow + 1
-	if len(history) < reqLen {
+// BulkEmbeddings returns the embedding for every close with a full window behind
+// it: row k belongs to closes[k+VectorWindow]. Log returns are computed once over
+// the whole series. Each window's mean/std come from windowMeanInvStd, the same
+// Welford pass Calculate runs, so a backfilled row equals the live embedding for
+// the same candles, flat windows included. All rows share one backing array.
+func (f *FeatureCalculator) BulkEmbeddings(closes []float64) [][]float64 {
+	w := f.VectorWindow
+	if w <= 0 || len(closes) < w+1 {
 		return nil
 	}
-
-	window := history[len(history)-reqLen:]
-
-	closes := make([]float64, len(window))
-	for i, d := range window {
-		closes[i] = d.Close
-	}
-
-	fmt.Println("closes: ", closes)
-
 	logReturns := CalculateLogReturn(closes)
-	embedding := CalculateZScore(logReturns)
-	lastCandle := window[len(window)-1]
 
-	return &PatternFeature{
-		Time:       time.Unix(lastCandle.Time, 0),
-		Symbol:     f.Symbol,
-		Interval:   f.Interval,
-		Embedding:  embedding,
-		ClosePrice: lastCandle.Close,
+	rows := len(closes) - w
+	flat := make([]float64, rows*w)
+	embeddings := make([][]float64, rows)
+	for k := 0; k < rows; k++ {
+		// window for close k+w is logReturns[k : k+w]
+		window := logReturns[k : k+w]
+		mean, inv := windowMeanInvStd(window)
+
+		row := flat[k*w : (k+1)*w : (k+1)*w]
+		for j, v := range window {
+			row[j] = (v - mean) * inv
+		}
+		embeddings[k] = row
 	}
+	return embeddings
 }
 
-func (f *FeatureCalculator) BulkCalculate(history []exchange.RestCandle) *PatternFeature {
-	reqLen := f.VectorWindow + 1
-	if len(history) < reqLen {
-		return nil
-	}
-
-	window := history[len(history)-reqLen:]
-
-	closes := make([]float64, len(window))
-	for i, d := range window {
-		closes[i] = d.Close
-	}
-
-	logReturns := CalculateLogReturn(closes)
-	embedding := CalculateZScore(logReturns)
-	lastCandle := window[len(window)-1]
-
-	return &PatternFeature{
-		Time:       time.Unix(lastCandle.Time, 0),
-		Symbol:     f.Symbol,
-		Interval:   f.Interval,
-		Embedding:  embedding,
-		ClosePrice: lastCandle.Close,
+// windowMeanInvStd returns the mean of vals and 1/(population std + PlanckConstant),
+// accumulated in the same order as Calculate. Rolling sums are not used: with only
+// PlanckConstant guarding the divide, their rounding residue on a flat window would
+// be scaled up instead of giving Calculate's exact zeros.
+func windowMeanInvStd(vals []float64) (mean, inv float64) {
+	m2 := 0.0
+	for i, v := range vals {
+		d := v - mean
+		mean += d / float64(i+1)
+		m2 += d * (v - mean)
 	}
+	return mean, 1 / (math.Sqrt(m2/float64(len(vals))) + PlanckConstant)
 }
@@ -274,7 +274,108 @@ func TestCalculate_LargerHistory_OnlyLastWindowAffectsEmbedding(t *testing.T) {
 	assert.Equal(t, resultBase.ClosePrice, resultWithPrefix.ClosePrice)
 }
 
-// -- test calculator
+// --- BulkEmbeddings ---
+
+func TestBulkEmbeddings_TooShortHistory_ReturnsNil(t *testing.T) {
+	// Arrange
+	fc := NewFeatureCalculator("BTCUSDT", "1h", 5)
+
+	// Act
+	result := fc.BulkEmbeddings([]float64{100.0, 110.0})
+
+	// Assert
+	assert.Nil(t, result)
+}
+
+func TestBulkEmbeddings_LastRowMatchesCalculateOnFullHistory(t *testing.T) {
+	// Arrange — 7 closes, window 3 → rows for closes 3..6
+	fc := NewFeatureCalculator("BTCUSDT", "1h", 3)
+	closes := []float64{100.0, 102.0, 101.0, 105.0, 103.0, 108.0, 107.0}
+
+	// Act
+	result := fc.BulkEmbeddings(closes)
+
+	// Assert
+	assert.Len(t, result, 4)
+	assert.InDeltaSlice(t, fc.Calculate(makeHistory(closes)).Embedding, result[3], 1e-9)
+}
+
+func TestBulkEmbeddings_RowsMatchCalculateAndDoNotAlias(t *testing.T) {
+	// Arrange
+	fc := NewFeatureCalculator("BTCUSDT", "1h", 3)
+	closes := []float64{100.0, 102.0, 101.0, 105.0, 103.0, 108.0, 107.0}
+	history := makeHistory(closes)
+
+	// Act
+	result := fc.BulkEmbeddings(closes)
+
+	// Assert
+	assert.Len(t, result, 4)
+	for k, row := range result {
+		expected := fc.Calculate(history[k : k+fc.VectorWindow+1])
+		assert.InDeltaSlice(t, expected.Embedding, row, 1e-9)
+		assert.Equal(t, fc.VectorWindow, cap(row))
+	}
+}
+
+func TestBulkEmbeddings_FlatSegment_RowsMatchCalculate(t *testing.T) {
+	// Arrange — moving prices, a flat run longer than the window, then moving again
+	fc := NewFeatureCalculator("BTCUSDT", "1h", 5)
+	closes := []float64{100.0, 100.3, 99.8, 101.2, 100.9, 102.4, 101.7, 103.1}
+	for i := 0; i < 12; i++ {
+		closes = append(closes, 103.1)
+	}
+	closes = append(closes, 103.4, 102.9, 104.0, 103.6, 104.8)
+	history := makeHistory(closes)
+
+	// Act
+	result := fc.BulkEmbeddings(closes)
+
+	// Assert
+	assert.Len(t, result, len(closes)-fc.VectorWindow)
+	for k, row := range result {
+		expected := fc.Calculate(history[k : k+fc.VectorWindow+1])
+		assert.InDeltaSlice(t, expected.Embedding, row, 1e-12, "row %d", k)
+	}
+	// closes 7..19 are flat, so windows ending at closes 12..19 are all zero returns
+	for i := 12; i <= 19; i++ {
+		assert.Equal(t, make([]float64, fc.VectorWindow), result[i-fc.VectorWindow], "close %d", i)
+	}
+}
+
+func TestCalculate_NonFlatEmbedding_SquaredNormEqualsWindow(t *testing.T) {
+	// Arrange — QueryTopN's inner-product ranking relies on this norm
+	fc := NewFeatureCalculator("BTCUSDT", "1h", 5)
+	history := makeHistory([]float64{100.0, 100.3, 99.8, 101.2, 100.9, 102.4})
+
+	// Act
+	result := fc.Calculate(history)
+
+	// Assert
+	assert.InDelta(t, float64(fc.VectorWindow), squaredNorm(result.Embedding), 1e-9)
+}
+
+func TestBulkEmbeddings_Rows_SquaredNormIsWindowOrZero(t *testing.T) {
+	// Arrange — a flat run longer than the window between moving prices
+	fc := NewFeatureCalculator("BTCUSDT", "1h", 5)
+	closes := []float64{100.0, 100.3, 99.8, 101.2, 100.9, 102.4, 101.7, 103.1}
+	for i := 0; i < 12; i++ {
+		closes = append(closes, 103.1)
+	}
+	closes = append(closes, 103.4, 102.9, 104.0, 103.6, 104.8)
+
+	// Act
+	result := fc.BulkEmbeddings(closes)
+
+	// Assert — flat windows (closes 12..19) are zero vectors, every other row has norm² = window
+	for k, row := range result {
+		want := float64(fc.VectorWindow)
+		if i := k + fc.VectorWindow; i >= 12 && i <= 19 {
+			want = 0
+		}
+		assert.InDelta(t, want, squaredNorm(row), 1e-9, "row %d", k)
+	}
+}
 
 // --- helpers ---
 
@@ -285,3 +386,11 @@ func isNaN(v float64) bool {
 func isInf(v float64) bool {
 	return v > 1e308 || v < -1e308
 }
+
+func squaredNorm(v []float64) float64 {
+	sum := 0.0
+	for _, x := range v {
+		sum += x * x
+	}
+	return sum
+}
@@ -5,39 +5,50 @@ import (
 	"time-series-rag-agent/internal/exchange"
 )
 
+// MergeCandles combines REST history with live WS candles into one ascending
+// series. A WS candle replaces the REST candle with the same Time.
+//
+// REST klines already arrive in time order, so the common case is one copy plus
+// a binary-search insert per WS candle; a sort only runs for unordered input.
 func MergeCandles(ws []exchange.WsCandle, rest []exchange.RestCandle) []exchange.WsRestCandle {
-	merged := make(map[int64]exchange.WsRestCandle)
-
+	result := make([]exchange.WsRestCandle, 0, len(rest)+len(ws))
 	for _, c := range rest {
-		merged[c.Time] = exchange.WsRestCandle{
-			Time:   c.Time,
-			Open:   c.Open,
-			High:   c.High,
-			Low:    c.Low,
-			Close:  c.Close,
-			Volume: c.Volume,
-		}
+		result = append(result, exchange.WsRestCandle(c))
 	}
 
-	for _, c := range ws {
-		merged[c.Time] = exchange.WsRestCandle{
-			Time:   c.Time,
-			Open:   c.Open,
-			High:   c.High,
-			Low:    c.Low,
-			Close:  c.Close,
-			Volume: c.Volume,
-		}
+	byTime := func(i, j int) bool { return result[i].Time < result[j].Time }
+	if !sort.SliceIsSorted(result, byTime) {
+		sort.SliceStable(result, byTime)
 	}
+	result = dedupeByTime(result)
 
-	result := make([]exchange.WsRestCandle, 0, len(merged))
-	for _, c := range merged {
-		result = append(result, c)
+	for _, c := range ws {
+		candle := exchange.WsRestCandle(c)
+		i := sort.Search(len(result), func(i int) bool { return result[i].Time >= c.Time })
+		if i < len(result) && result[i].Time == c.Time {
+			result[i] = candle
+			continue
+		}
+		result = append(result, exchange.WsRestCandle{})
+		copy(result[i+1:], result[i:])
+		result[i] = candle
 	}
 
-	sort.Slice(result, func(i, j int) bool {
-		return result[i].Time < result[j].Time
-	})
-
 	return result
 }
+
+// dedupeByTime keeps the last candle of each run with equal Time in a sorted slice.
+func dedupeByTime(candles []exchange.WsRestCandle) []exchange.WsRestCandle {
+	if len(candles) < 2 {
+		return candles
+	}
+	out := candles[:1]
+	for _, c := range candles[1:] {
+		if c.Time == out[len(out)-1].Time {
+			out[len(out)-1] = c
+			continue
+		}
+		out = append(out, c)
+	}
+	return out
+}
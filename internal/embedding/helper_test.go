@@ -91,3 +91,24 @@ func TestMergeCandles_BothEmpty(t *testing.T) {
 	// Assert
 	assert.Len(t, result, 0)
 }
+
+func TestMergeCandles_WsBetweenAndAfterRest_InsertedInOrder(t *testing.T) {
+	// Arrange
+	rest := []exchange.RestCandle{
+		{Time: 1000, Close: 103.0},
+		{Time: 3000, Close: 112.0},
+	}
+	ws := []exchange.WsCandle{
+		{Time: 4000, Close: 115.0},
+		{Time: 2000, Close: 107.0},
+		{Time: 3000, Close: 113.0},
+	}
+
+	// Act
+	result := MergeCandles(ws, rest)
+
+	// Assert
+	assert.Len(t, result, 4)
+	assert.Equal(t, []int64{1000, 2000, 3000, 4000}, []int64{result[0].Time, result[1].Time, result[2].Time, result[3].Time})
+	assert.Equal(t, 113.0, result[2].Close)
+}
@@ -1,11 +1,13 @@
 package embedding
 
-import "time-series-rag-agent/internal/exchange"
+import (
+	"math"
+	"time-series-rag-agent/internal/exchange"
+)
 
 // LabelCalculatorI allows mocking in tests.
 type LabelCalculatorI interface {
 	CalculateFromHistory(history []exchange.WsRestCandle) []LabelUpdate
-	CalculateLookahead(history []exchange.WsRestCandle, idx int, targetTime int64) []LabelUpdate
 }
 
 // LabelCalculator computes label updates for training data.
@@ -18,114 +20,89 @@ func NewLabelCalculator() *LabelCalculator {
 // CalculateFromHistory generates label updates for past candles based on recent data.
 // Used in streaming/live mode: each new candle unlocks labels for earlier candles.
 func (l *LabelCalculator) CalculateFromHistory(history []exchange.WsRestCandle) []LabelUpdate {
-	updates := []LabelUpdate{}
 	n := len(history)
 	if n < 2 {
-		return updates
+		return []LabelUpdate{}
 	}
+	updates := make([]LabelUpdate, 0, 3)
 
 	// Label A: Next Return for candle at T-1
 	if update, ok := l.calcNextReturn(history, n-2, n-1); ok {
 		updates = append(updates, update)
 	}
 
-	// Label B: Slope 3 for candle at T-3
-	targetIdx3 := n - 4
-	if targetIdx3 >= 0 {
-		futurePrices := closesSlice(history, n-3, n)
-		updates = append(updates, LabelUpdate{
-			TargetTime: history[targetIdx3].Time,
-			Column:     "next_slope_3",
-			Value:      CalculateSlope(futurePrices),
-		})
-	}
-
-	// Label C: Slope 5 for candle at T-5
-	targetIdx5 := n - 6
-	if targetIdx5 >= 0 {
-		futurePrices := closesSlice(history, targetIdx5+1, n)
-		updates = append(updates, LabelUpdate{
-			TargetTime: history[targetIdx5].Time,
-			Column:     "next_slope_5",
-			Value:      CalculateSlope(futurePrices),
-		})
-	}
-
-	return updates
-}
-
-func (l *LabelCalculator) CalculateCanelFromHistory(history []exchange.WsRestCandle) []LabelUpdate {
-	updates := []LabelUpdate{}
-	n := len(history)
-	if n < 2 {
-		return updates
-	}
-
-	// Label A: Next Return for candle at T-1
-	if update, ok := l.calcNextReturn(history, n-2, n-1); ok {
-		updates = append(updates, update)
+	// Only the last five closes feed the slopes: copy them once onto the stack
+	// and take both windows as sub-slices of that.
+	var buf [5]float64
+	k := min(n, len(buf))
+	tail := buf[len(buf)-k:]
+	for i := range tail {
+		tail[i] = history[n-k+i].Close
 	}
 
 	// Label B: Slope 3 for candle at T-3
 	targetIdx3 := n - 4
 	if targetIdx3 >= 0 {
-		futurePrices := closesSlice(history, n-3, n)
 		updates = append(updates, LabelUpdate{
 			TargetTime: history[targetIdx3].Time,
 			Column:     "next_slope_3",
-			Value:      CalculateSlope(futurePrices),
+			Value:      CalculateSlope(tail[len(tail)-3:]),
 		})
 	}
 
 	// Label C: Slope 5 for candle at T-5
 	targetIdx5 := n - 6
 	if targetIdx5 >= 0 {
-		futurePrices := closesSlice(history, targetIdx5+1, n)
 		updates = append(updates, LabelUpdate{
 			TargetTime: history[targetIdx5].Time,
 			Column:     "next_slope_5",
-			Value:      CalculateSlope(futurePrices),
+			Value:      CalculateSlope(tail),
 		})
 	}
 
 	return updates
 }
 
-// CalculateLookahead generates labels by looking AHEAD from idx.
+// LookaheadColumnsFromCloses generates labels by looking AHEAD from every close
+// from index `from` onward, as three columns (index 0 = close `from`).
 // Used in bulk mode: we know the future, so we compute labels directly.
-func (l *LabelCalculator) CalculateLookahead(history []exchange.WsRestCandle, idx int, targetTime int64) []LabelUpdate {
-	updates := []LabelUpdate{}
-	n := len(history)
+// Labels without enough future closes, or next_return on a zero close, are NaN.
+// Slope windows are sub-slices of closes, so nothing is copied.
+func (l *LabelCalculator) LookaheadColumnsFromCloses(closes []float64, from int) (nextReturn, nextSlope3, nextSlope5 []float64) {
+	n := len(closes)
+	if from < 0 {
+		from = 0
+	}
+	if from >= n {
+		return []float64{}, []float64{}, []float64{}
+	}
 
-	// Label A: Next Return (T+1)
-	if idx+1 < n {
-		if update, ok := l.calcNextReturn(history, idx, idx+1); ok {
-			update.TargetTime = targetTime
-			updates = append(updates, update)
+	m := n - from
+	nextReturn = make([]float64, m)
+	nextSlope3 = make([]float64, m)
+	nextSlope5 = make([]float64, m)
+
+	// One tight pass per column over its own valid range, then NaN only the
+	// tail rows that lack enough future candles.
+	nan := math.NaN()
+	for idx := from; idx+1 < n; idx++ {
+		if closes[idx] != 0 {
+			nextReturn[idx-from] = (closes[idx+1] - closes[idx]) / closes[idx]
+		} else {
+			nextReturn[idx-from] = nan
 		}
 	}
-
-	// Label B: Slope 3 (T+1 to T+3)
-	if idx+3 < n {
-		futurePrices := closesSlice(history, idx+1, idx+4)
-		updates = append(updates, LabelUpdate{
-			TargetTime: targetTime,
-			Column:     "next_slope_3",
-			Value:      CalculateSlope(futurePrices),
-		})
+	for idx := from; idx+3 < n; idx++ {
+		nextSlope3[idx-from] = CalculateSlope(closes[idx+1 : idx+4])
 	}
-
-	// Label C: Slope 5 (T+1 to T+5)
-	if idx+5 < n {
-		futurePrices := closesSlice(history, idx+1, idx+6)
-		updates = append(updates, LabelUpdate{
-			TargetTime: targetTime,
-			Column:     "next_slope_5",
-			Value:      CalculateSlope(futurePrices),
-		})
+	for idx := from; idx+5 < n; idx++ {
+		nextSlope5[idx-from] = CalculateSlope(closes[idx+1 : idx+6])
 	}
+	fillNaNTail(nextReturn, n-1-from)
+	fillNaNTail(nextSlope3, n-3-from)
+	fillNaNTail(nextSlope5, n-5-from)
 
-	return updates
+	return nextReturn, nextSlope3, nextSlope5
 }
 
 // --- helpers ---
@@ -143,10 +120,13 @@ func (l *LabelCalculator) calcNextReturn(history []exchange.WsRestCandle, prevId
 	}, true
 }
 
-func closesSlice(history []exchange.WsRestCandle, from, to int) []float64 {
-	prices := make([]float64, 0, to-from)
-	for i := from; i < to; i++ {
-		prices = append(prices, history[i].Close)
+// fillNaNTail sets col[valid:] to NaN; valid is clamped to [0, len(col)].
+func fillNaNTail(col []float64, valid int) {
+	if valid < 0 {
+		valid = 0
+	}
+	nan := math.NaN()
+	for i := valid; i < len(col); i++ {
+		col[i] = nan
 	}
-	return prices
 }
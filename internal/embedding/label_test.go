@@ -1,6 +1,7 @@
 package embedding
 
 import (
+	"math"
 	"testing"
 	"time-series-rag-agent/internal/exchange"
 
@@ -185,144 +186,147 @@ func TestCalculateFromHistory_DecreasingPrices_NegativeSlopes(t *testing.T) {
 	assert.Less(t, slope5.Value, 0.0)
 }
 
-// --- CalculateLookahead ---
+// --- LookaheadColumnsFromCloses ---
 
-func TestCalculateLookahead_NoFutureData_ReturnsEmpty(t *testing.T) {
+func TestLookaheadColumnsFromCloses_NoFutureData_AllNaN(t *testing.T) {
 	// Arrange
 	lc := NewLabelCalculator()
-	history := makeHistory([]float64{100.0, 110.0})
 
-	// Act — idx=1 is the last element, nothing ahead
-	result := lc.CalculateLookahead(history, 1, 9999)
+	// Act — from=1 is the last element, nothing ahead
+	nextReturn, nextSlope3, nextSlope5 := lc.LookaheadColumnsFromCloses([]float64{100.0, 110.0}, 1)
 
 	// Assert
-	assert.Empty(t, result)
+	assert.Len(t, nextReturn, 1)
+	assert.True(t, math.IsNaN(nextReturn[0]))
+	assert.True(t, math.IsNaN(nextSlope3[0]))
+	assert.True(t, math.IsNaN(nextSlope5[0]))
 }
 
-func TestCalculateLookahead_NextReturn_CorrectValue(t *testing.T) {
+func TestLookaheadColumnsFromCloses_NextReturn_CorrectValue(t *testing.T) {
 	// Arrange
 	lc := NewLabelCalculator()
 	// idx=1 close=110, idx+1 close=132 → return = (132-110)/110 = 0.2
-	history := makeHistory([]float64{100.0, 110.0, 132.0})
+	closes := []float64{100.0, 110.0, 132.0}
 
 	// Act
-	result := lc.CalculateLookahead(history, 1, 5000)
+	nextReturn, _, _ := lc.LookaheadColumnsFromCloses(closes, 1)
 
 	// Assert
-	nr := findByColumn(result, "next_return")
-	assert.NotNil(t, nr)
-	assert.InDelta(t, 0.2, nr.Value, 1e-9)
+	assert.InDelta(t, 0.2, nextReturn[0], 1e-9)
 }
 
-func TestCalculateLookahead_NextReturn_NegativeReturn(t *testing.T) {
+func TestLookaheadColumnsFromCloses_NextReturn_NegativeReturn(t *testing.T) {
 	// Arrange
 	lc := NewLabelCalculator()
 	// idx=1 close=200, idx+1 close=150 → return = (150-200)/200 = -0.25
-	history := makeHistory([]float64{100.0, 200.0, 150.0})
+	closes := []float64{100.0, 200.0, 150.0}
 
 	// Act
-	result := lc.CalculateLookahead(history, 1, 5000)
+	nextReturn, _, _ := lc.LookaheadColumnsFromCloses(closes, 1)
 
 	// Assert
-	nr := findByColumn(result, "next_return")
-	assert.NotNil(t, nr)
-	assert.InDelta(t, -0.25, nr.Value, 1e-9)
+	assert.InDelta(t, -0.25, nextReturn[0], 1e-9)
 }
 
-func TestCalculateLookahead_NextReturn_UsesTargetTimeParam(t *testing.T) {
+func TestLookaheadColumnsFromCloses_Slope3_CorrectValue(t *testing.T) {
 	// Arrange
 	lc := NewLabelCalculator()
-	history := makeHistory([]float64{100.0, 110.0, 121.0})
+	// idx=1, future 3 = [120, 130, 140]
+	closes := []float64{100.0, 110.0, 120.0, 130.0, 140.0}
+	expectedSlope := CalculateSlope([]float64{120.0, 130.0, 140.0})
 
 	// Act
-	result := lc.CalculateLookahead(history, 1, 5000)
+	_, nextSlope3, _ := lc.LookaheadColumnsFromCloses(closes, 1)
 
 	// Assert
-	assert.Equal(t, int64(5000), result[0].TargetTime)
+	assert.InDelta(t, expectedSlope, nextSlope3[0], 1e-9)
 }
 
-func TestCalculateLookahead_Slope3_CorrectValue(t *testing.T) {
+func TestLookaheadColumnsFromCloses_Slope5_CorrectValue(t *testing.T) {
 	// Arrange
 	lc := NewLabelCalculator()
-	// idx=1, future 3 = [120, 130, 140]
-	history := makeHistory([]float64{100.0, 110.0, 120.0, 130.0, 140.0})
-	expectedSlope := CalculateSlope([]float64{120.0, 130.0, 140.0})
+	// idx=1, future 5 = [104, 106, 108, 110, 112]
+	closes := []float64{100.0, 102.0, 104.0, 106.0, 108.0, 110.0, 112.0}
+	expectedSlope := CalculateSlope([]float64{104.0, 106.0, 108.0, 110.0, 112.0})
 
 	// Act
-	result := lc.CalculateLookahead(history, 1, 5000)
+	_, _, nextSlope5 := lc.LookaheadColumnsFromCloses(closes, 1)
 
 	// Assert
-	slope3 := findByColumn(result, "next_slope_3")
-	assert.NotNil(t, slope3)
-	assert.InDelta(t, expectedSlope, slope3.Value, 1e-9)
+	assert.InDelta(t, expectedSlope, nextSlope5[0], 1e-9)
 }
 
-func TestCalculateLookahead_Slope5_CorrectValue(t *testing.T) {
+func TestLookaheadColumnsFromCloses_Slope3NotAvailable_WhenOnlyTwoFuture(t *testing.T) {
 	// Arrange
 	lc := NewLabelCalculator()
-	// idx=1, future 5 = [104, 106, 108, 110, 112]
-	history := makeHistory([]float64{100.0, 102.0, 104.0, 106.0, 108.0, 110.0, 112.0})
-	expectedSlope := CalculateSlope([]float64{104.0, 106.0, 108.0, 110.0, 112.0})
+	// idx=1, only 2 future candles → slope3 needs 3 ahead
+	closes := []float64{100.0, 110.0, 120.0, 130.0}
 
 	// Act
-	result := lc.CalculateLookahead(history, 1, 5000)
+	_, nextSlope3, _ := lc.LookaheadColumnsFromCloses(closes, 1)
 
 	// Assert
-	slope5 := findByColumn(result, "next_slope_5")
-	assert.NotNil(t, slope5)
-	assert.InDelta(t, expectedSlope, slope5.Value, 1e-9)
+	assert.True(t, math.IsNaN(nextSlope3[0]))
 }
 
-func TestCalculateLookahead_Slope3NotAvailable_WhenOnlyTwoFuture(t *testing.T) {
+func TestLookaheadColumnsFromCloses_PrevCloseZero_NextReturnNaN(t *testing.T) {
 	// Arrange
 	lc := NewLabelCalculator()
-	// idx=1, only 2 future candles → slope3 needs 3 ahead (idx+3 < n fails)
-	history := makeHistory([]float64{100.0, 110.0, 120.0, 130.0})
+	closes := []float64{100.0, 0.0, 110.0}
 
-	// Act
-	result := lc.CalculateLookahead(history, 1, 5000)
+	// Act — idx=1 has Close=0
+	nextReturn, _, _ := lc.LookaheadColumnsFromCloses(closes, 1)
 
 	// Assert
-	columns := columnsOf(result)
-	assert.NotContains(t, columns, "next_slope_3")
+	assert.True(t, math.IsNaN(nextReturn[0]))
 }
 
-func TestCalculateLookahead_AllLabels_UseTargetTime(t *testing.T) {
+func TestLookaheadColumnsFromCloses_EachRow_UsesItsOwnFutureWindow(t *testing.T) {
 	// Arrange
 	lc := NewLabelCalculator()
-	history := makeHistory([]float64{100.0, 102.0, 104.0, 106.0, 108.0, 110.0, 112.0})
+	closes := []float64{100.0, 102.0, 101.0, 105.0, 104.0, 108.0, 107.0, 110.0, 109.0}
+	from := 2
 
 	// Act
-	result := lc.CalculateLookahead(history, 1, 7777)
+	nextReturn, nextSlope3, nextSlope5 := lc.LookaheadColumnsFromCloses(closes, from)
 
 	// Assert
-	for _, u := range result {
-		assert.Equal(t, int64(7777), u.TargetTime, "column %s should have targetTime 7777", u.Column)
+	assert.Len(t, nextReturn, len(closes)-from)
+	for i := from; i < len(closes); i++ {
+		row := i - from
+		if i+1 < len(closes) {
+			assert.InDelta(t, (closes[i+1]-closes[i])/closes[i], nextReturn[row], 1e-12, "index %d", i)
+		} else {
+			assert.True(t, math.IsNaN(nextReturn[row]), "index %d", i)
+		}
+		if i+3 < len(closes) {
+			assert.InDelta(t, CalculateSlope(closes[i+1:i+4]), nextSlope3[row], 1e-12, "index %d", i)
+		} else {
+			assert.True(t, math.IsNaN(nextSlope3[row]), "index %d", i)
+		}
+		if i+5 < len(closes) {
+			assert.InDelta(t, CalculateSlope(closes[i+1:i+6]), nextSlope5[row], 1e-12, "index %d", i)
+		} else {
+			assert.True(t, math.IsNaN(nextSlope5[row]), "index %d", i)
+		}
 	}
 }
 
-func TestCalculateLookahead_PrevCloseZero_NextReturnSkipped(t *testing.T) {
+func TestLookaheadColumnsFromCloses_FromPastEnd_ReturnsEmpty(t *testing.T) {
 	// Arrange
 	lc := NewLabelCalculator()
-	history := makeHistory([]float64{100.0, 0.0, 110.0})
 
-	// Act — idx=1 has Close=0
-	result := lc.CalculateLookahead(history, 1, 5000)
+	// Act
+	nextReturn, nextSlope3, nextSlope5 := lc.LookaheadColumnsFromCloses([]float64{100.0, 110.0}, 5)
 
 	// Assert
-	assert.NotContains(t, columnsOf(result), "next_return")
+	assert.Empty(t, nextReturn)
+	assert.Empty(t, nextSlope3)
+	assert.Empty(t, nextSlope5)
 }
 
 // --- helpers ---
 
-func columnsOf(updates []LabelUpdate) []string {
-	cols := make([]string, len(updates))
-	for i, u := range updates {
-		cols[i] = u.Column
-	}
-	return cols
-}
-
 func findByColumn(updates []LabelUpdate, column string) *LabelUpdate {
 	for i := range updates {
 		if updates[i].Column == column {
@@ -13,42 +13,65 @@ func CalculateLogReturn(closes []float64) []float64 {
 	}
 	res := make([]float64, len(closes)-1)
 	for i := 1; i < len(closes); i++ {
-		curr := math.Log(closes[i] + PlanckConstant)
-		prev := math.Log(closes[i-1] + PlanckConstant)
-		res[i-1] = curr - prev
+		res[i-1] = logReturn(closes[i-1], closes[i])
 	}
 	return res
 }
 
+// logReturn is log(curr/prev) computed as log1p of the relative change: one log
+// instead of two, and no cancellation when adjacent closes are nearly equal.
+// A zero close keeps the PlanckConstant form so the result stays finite.
+func logReturn(prev, curr float64) float64 {
+	if prev == 0 || curr == 0 {
+		return math.Log(curr+PlanckConstant) - math.Log(prev+PlanckConstant)
+	}
+	return math.Log1p((curr - prev) / prev)
+}
+
 // CalculateZScore normalizes a slice to zero mean and unit variance.
 func CalculateZScore(data []float64) []float64 {
 	if len(data) == 0 {
 		return []float64{}
 	}
 
-	sum := 0.0
-	for _, v := range data {
-		sum += v
-	}
-	mean := sum / float64(len(data))
+	mean, std := meanStd(data)
+	return normalizeZScore(data, mean, std)
+}
 
-	sqDiffSum := 0.0
-	for _, v := range data {
-		sqDiffSum += math.Pow(v-mean, 2)
+// meanStd returns the mean and population standard deviation in a single pass
+// (Welford), so the data is read once before normalizing.
+func meanStd(data []float64) (float64, float64) {
+	mean, m2 := 0.0, 0.0
+	for i, v := range data {
+		d := v - mean
+		mean += d / float64(i+1)
+		m2 += d * (v - mean)
 	}
-	std := math.Sqrt(sqDiffSum / float64(len(data)))
+	return mean, math.Sqrt(m2 / float64(len(data)))
+}
 
+// normalizeZScore applies (v-mean)/std with precomputed statistics.
+// The divisor is inverted once so the per-element work is a subtract and a multiply.
+func normalizeZScore(data []float64, mean, std float64) []float64 {
 	res := make([]float64, len(data))
+	inv := 1 / (std + PlanckConstant)
 	for i, v := range data {
-		res[i] = (v - mean) / (std + PlanckConstant)
+		res[i] = (v - mean) * inv
 	}
 	return res
 }
 
 // CalculateSlope computes the linear regression slope of normalized prices.
 // Equivalent to np.polyfit(x, y_norm, 1)[0].
+//
+// x is always 0..n-1, so the OLS denominator is the closed form n(n²-1)/12 and,
+// because Σ(x-x̄)=0, the normalization offset drops out of the numerator:
+// slope = Σ(x-x̄)·p / (startVal · n(n²-1)/12).
+//
+// The label horizons (3 and 5) use their constant centered weights directly:
+// n=3 → (-1,0,1)/2, n=5 → (-2,-1,0,1,2)/10.
 func CalculateSlope(prices []float64) float64 {
-	n := float64(len(prices))
+	n := len(prices)
 	if n < 2 {
 		return 0.0
 	}
@@ -58,20 +81,19 @@ func CalculateSlope(prices []float64) float64 {
 		startVal = 1e-9
 	}
 
-	sumX, sumY, sumXY, sumX2 := 0.0, 0.0, 0.0, 0.0
-	for i, p := range prices {
-		x := float64(i)
-		yNorm := (p - startVal) / startVal
-		sumX += x
-		sumY += yNorm
-		sumXY += x * yNorm
-		sumX2 += x * x
+	switch n {
+	case 3:
+		return (prices[2] - prices[0]) / (startVal * 2)
+	case 5:
+		return (2*(prices[4]-prices[0]) + (prices[3] - prices[1])) / (startVal * 10)
 	}
 
-	numerator := (n * sumXY) - (sumX * sumY)
-	denominator := (n * sumX2) - (sumX * sumX)
-	if denominator == 0 {
-		return 0.0
+	xMean := float64(n-1) / 2
+	num := 0.0
+	for i, p := range prices {
+		num += (float64(i) - xMean) * p
 	}
-	return numerator / denominator
+
+	fn := float64(n)
+	return num / (startVal * fn * (fn*fn - 1) / 12)
 }
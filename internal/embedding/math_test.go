@@ -69,6 +69,17 @@ func TestCalculateLogReturn_FlatPrices_ReturnsNearZero(t *testing.T) {
 	assert.InDelta(t, 0.0, result[1], 1e-9)
 }
 
+func TestCalculateLogReturn_NearlyEqualCloses_MatchesRelativeChange(t *testing.T) {
+	// Arrange — 1e-10 relative move on a large price
+	closes := []float64{65000.0, 65000.0 * (1 + 1e-10)}
+
+	// Act
+	result := CalculateLogReturn(closes)
+
+	// Assert
+	assert.InDelta(t, 1e-10, result[0], 1e-15)
+}
+
 // --- CalculateZScore ---
 
 func TestCalculateZScore_NormalInput_MeanNearZero(t *testing.T) {
@@ -181,6 +192,31 @@ func TestCalculateSlope_FlatPrices_NearZeroSlope(t *testing.T) {
 	assert.InDelta(t, 0.0, result, 1e-9)
 }
 
+func TestCalculateSlope_LinearPrices_MatchesPolyfit(t *testing.T) {
+	// Arrange — y_norm = 0, 0.1, 0.2, 0.3 → polyfit slope 0.1
+	prices := []float64{100.0, 110.0, 120.0, 130.0}
+
+	// Act
+	result := CalculateSlope(prices)
+
+	// Assert
+	assert.InDelta(t, 0.1, result, 1e-12)
+}
+
+func TestCalculateSlope_LabelHorizons_MatchGeneralForm(t *testing.T) {
+	// Arrange — polyfit on y_norm: n=3 → 0.10/2 = 0.05, n=5 → (2·0.04 + 0.03)/10 = 0.011
+	prices3 := []float64{100.0, 103.0, 110.0}
+	prices5 := []float64{100.0, 101.0, 99.0, 104.0, 104.0}
+
+	// Act
+	slope3 := CalculateSlope(prices3)
+	slope5 := CalculateSlope(prices5)
+
+	// Assert
+	assert.InDelta(t, 0.05, slope3, 1e-12)
+	assert.InDelta(t, 0.011, slope5, 1e-12)
+}
+
 func TestCalculateSlope_SingleElement_ReturnsZero(t *testing.T) {
 	// Arrange
 	prices := []float64{100.0}
@@ -33,9 +33,23 @@ type LabelUpdate struct {
 	Value      float64
 }
 
-type BulkResult struct {
-	Feature PatternFeature
-	Labels  []LabelUpdate
+// PatternBatch is a column-oriented (struct-of-arrays) set of rows for one
+// symbol/interval, used by bulk ingest. Row i is Time[i], ClosePrice[i],
+// Embedding[i] and the three labels at i; a label that is not known yet is NaN.
+type PatternBatch struct {
+	Symbol     string
+	Interval   string
+	Time       []int64
+	ClosePrice []float64
+	Embedding  [][]float64
+	NextReturn []float64
+	NextSlope3 []float64
+	NextSlope5 []float64
+}
+
+// Len returns the number of rows in the batch.
+func (b *PatternBatch) Len() int {
+	return len(b.Time)
 }
 
 // SimilarityPct converts cosine distance to similarity percentage
@@ -0,0 +1,49 @@
+package exchange
+
+import (
+	"strings"
+	"time"
+)
+
+// intervalReplacer maps Binance day/week intervals that time.ParseDuration
+// cannot handle onto hour units. Built once; strings.Replacer is safe for concurrent use.
+var intervalReplacer = strings.NewReplacer("1d", "24h", "2d", "48h", "3d", "72h", "1w", "168h")
+
+// binanceIntervals holds every kline interval Binance offers, so the per-bar
+// callers hit a map lookup instead of Replace + ParseDuration.
+var binanceIntervals = map[string]time.Duration{
+	"1m":  time.Minute,
+	"3m":  3 * time.Minute,
+	"5m":  5 * time.Minute,
+	"15m": 15 * time.Minute,
+	"30m": 30 * time.Minute,
+	"1h":  time.Hour,
+	"2h":  2 * time.Hour,
+	"4h":  4 * time.Hour,
+	"6h":  6 * time.Hour,
+	"8h":  8 * time.Hour,
+	"12h": 12 * time.Hour,
+	"1d":  24 * time.Hour,
+	"3d":  72 * time.Hour,
+	"1w":  168 * time.Hour,
+}
+
+// ParseIntervalDuration converts Binance interval strings (e.g. "15m", "1d", "1w")
+// into a time.Duration.
+func ParseIntervalDuration(s string) (time.Duration, error) {
+	if d, ok := binanceIntervals[s]; ok {
+		return d, nil
+	}
+	return time.ParseDuration(intervalReplacer.Replace(s))
+}
+
+// SnapToInterval floors a unix timestamp (seconds) to the open of its interval bar.
+func SnapToInterval(unix int64, intervalSecs int64) int64 {
+	return unix - unix%intervalSecs
+}
+
+// untilNextBoundary returns how long from now until the next interval bar opens.
+func untilNextBoundary(now time.Time, intervalSecs int64) time.Duration {
+	next := time.Unix(SnapToInterval(now.Unix(), intervalSecs)+intervalSecs, 0)
+	return next.Sub(now)
+}
@@ -0,0 +1,60 @@
+package exchange
+
+import (
+	"testing"
+	"time"
+
+	"github.com/stretchr/testify/assert"
+)
+
+func TestParseIntervalDuration_MinuteAndDayIntervals(t *testing.T) {
+	// Arrange
+	cases := map[string]time.Duration{
+		"15m": 15 * time.Minute,
+		"1h":  time.Hour,
+		"1d":  24 * time.Hour,
+		"1w":  168 * time.Hour,
+	}
+
+	for in, want := range cases {
+		// Act
+		got, err := ParseIntervalDuration(in)
+
+		// Assert
+		assert.NoError(t, err, in)
+		assert.Equal(t, want, got, in)
+	}
+}
+
+func TestParseIntervalDuration_TableMatchesParsedForm(t *testing.T) {
+	for in, want := range binanceIntervals {
+		// Act
+		got, err := time.ParseDuration(intervalReplacer.Replace(in))
+
+		// Assert
+		assert.NoError(t, err, in)
+		assert.Equal(t, want, got, in)
+	}
+}
+
+func TestSnapToInterval_FloorsToBarOpen(t *testing.T) {
+	// Arrange — 1_000_123 is 223s into the 15m bar that opens at 999_900
+	const unix = int64(1_000_123)
+
+	// Act
+	got := SnapToInterval(unix, 900)
+
+	// Assert
+	assert.Equal(t, int64(999_900), got)
+}
+
+func TestUntilNextBoundary_MidBar_ReturnsRemainder(t *testing.T) {
+	// Arrange — 223.5s into the 15m bar that opens at 999_900
+	now := time.Unix(1_000_123, 500_000_000)
+
+	// Act
+	got := untilNextBoundary(now, 900)
+
+	// Assert
+	assert.Equal(t, 676*time.Second+500*time.Millisecond, got)
+}
@@ -26,3 +26,14 @@ type WsRestCandle struct {
 	Close  float64
 	Volume float64
 }
+
+// ToWsRestCandles converts REST candles into the merged candle type consumed by
+// the embedding, label and prefilter code. The structs share a layout, so each
+// element is a plain conversion.
+func ToWsRestCandles(rest []RestCandle) []WsRestCandle {
+	out := make([]WsRestCandle, len(rest))
+	for i, c := range rest {
+		out[i] = WsRestCandle(c)
+	}
+	return out
+}
@@ -109,10 +109,10 @@ func (e *Executor) CancelTrade(ctx context.Context) error {
 func (e *Executor) PlaceTrade(ctx context.Context, side string, priceToPlace float64) error {
 	// Deterministic client IDs scoped to the current 15-minute bar.
 	// Same ID on retry → Binance rejects the duplicate instead of filling twice.
-	barOpen := time.Now().UTC().Truncate(15 * time.Minute)
-	mainClientID := fmt.Sprintf("M-%d-%s", barOpen.Unix(), side)
-	slClientID := fmt.Sprintf("S-%d-%s", barOpen.Unix(), side)
-	tpClientID := fmt.Sprintf("T-%d-%s", barOpen.Unix(), side)
+	barOpen := SnapToInterval(time.Now().Unix(), 15*60)
+	mainClientID := fmt.Sprintf("M-%d-%s", barOpen, side)
+	slClientID := fmt.Sprintf("S-%d-%s", barOpen, side)
+	tpClientID := fmt.Sprintf("T-%d-%s", barOpen, side)
 
 	e.Log.Info(fmt.Sprintln("[Executor] 🧹 Cleaning up open orders..."))
 	if err := e.CancelAllOpenOrders(ctx); err != nil {
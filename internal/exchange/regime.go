@@ -12,27 +12,8 @@ import (
 	"time-series-rag-agent/config"
 )
 
-type RegimeTrend struct {
-}
-
-type InputData struct {
-	Time  int64
-	Open  float64
-	High  float64
-	Low   float64
-	Close float64
-}
-
 type Regime string
 
-type RegimeConfig struct {
-	ADXTrendThreshold    float64
-	ADXRangeThreshold    float64
-	ATRVolatileThreshold float64
-	BandWidthThreshold   float64
-	BandWidthPeriod      int
-}
-
 type IntervalRegime struct {
 	Interval string
 	Time     time.Time
@@ -82,34 +63,7 @@ func FetchLatestRegimes(
 			continue
 		}
 
-		adx := CalcADX(candles, 14)
-		bbw := CalcBandWidth(candles, 20)
-		atrRatio := CalcATRRatio(candles)
-
-		result := RegimeResult{
-			ADX:       adx.ADX,
-			PlusDI:    adx.PlusDI,
-			MinusDI:   adx.MinusDI,
-			ATRRatio:  atrRatio,
-			BandWidth: bbw,
-			Regime:    "UNKNOWN",
-		}
-
-		switch {
-		case atrRatio > cfg.Regime.ATRVolatileThreshold:
-			result.Regime = "VOLATILE"
-
-		case adx.ADX > cfg.Regime.ADXTrendThreshold && atrRatio < cfg.Regime.ATRVolatileThreshold:
-			result.Regime = "TRENDING"
-			if adx.PlusDI > adx.MinusDI {
-				result.Direction = "BULL"
-			} else {
-				result.Direction = "BEAR"
-			}
-
-		case adx.ADX < cfg.Regime.ADXRangeThreshold && bbw < cfg.Regime.BandWidthThreshold:
-			result.Regime = "RANGING"
-		}
+		result := classifyRegime(cfg.Regime, candles)
 
 		// time ของ candle ล่าสุด
 		latestCandle := candles[len(candles)-1]
@@ -129,34 +83,26 @@ func FetchLatestRegimes(
 	return results, nil
 }
 
-func (r *RegimeTrend) PredictTrend(logger slog.Logger, Symbol string, Interval string, VectorWindow int, candle []RestCandle) (RegimeResult, error) {
-	cfg := config.LoadConfig()
-	logger.Info("Predicting market trend using regime detection...")
-
-	// calculate ADX
-	adx := CalcADX(candle, 14)
-	logger.Info("Calculated ADX", "adx", adx.ADX)
-
-	// calculate BBW
-	bandWidth := CalcBandWidth(candle, 20)
-	logger.Info("Calculated BBW", " bbw", bandWidth)
-
-	// calculate ATR
-	atrRatio := CalcATRRatio(candle)
-	logger.Info("Calculated ATR Ratio", "atrRatio", atrRatio)
+// classifyRegime labels the latest market regime from ADX, band width and ATR ratio.
+func classifyRegime(rc config.RegimeConfig, candles []RestCandle) RegimeResult {
+	adx := CalcADX(candles, 14)
+	bbw := CalcBandWidth(candles, 20)
+	atrRatio := CalcATRRatio(candles)
 
 	result := RegimeResult{
 		ADX:       adx.ADX,
+		PlusDI:    adx.PlusDI,
+		MinusDI:   adx.MinusDI,
 		ATRRatio:  atrRatio,
-		BandWidth: bandWidth,
+		BandWidth: bbw,
 		Regime:    "UNKNOWN",
 	}
 
 	switch {
-	case atrRatio > cfg.Regime.ATRVolatileThreshold:
+	case atrRatio > rc.ATRVolatileThreshold:
 		result.Regime = "VOLATILE"
 
-	case adx.ADX > cfg.Regime.ADXTrendThreshold && atrRatio < cfg.Regime.ATRVolatileThreshold:
+	case adx.ADX > rc.ADXTrendThreshold && atrRatio < rc.ATRVolatileThreshold:
 		result.Regime = "TRENDING"
 		if adx.PlusDI > adx.MinusDI {
 			result.Direction = "BULL"
@@ -164,14 +110,13 @@ func (r *RegimeTrend) PredictTrend(logger slog.Logger, Symbol string, Interval s
 			result.Direction = "BEAR"
 		}
 
-	case adx.ADX < cfg.Regime.ADXRangeThreshold && bandWidth < cfg.Regime.BandWidthThreshold:
+	case adx.ADX < rc.ADXRangeThreshold && bbw < rc.BandWidthThreshold:
 		result.Regime = "RANGING"
 	}
 
-	return result, nil
+	return result
 }
 
-// Calculations for regime detection would go here, but for simplicity, we return a fixed value. //
 // ATR Ratio Calculation
 func trueRange(c, prev RestCandle) float64 {
 	return math.Max(
@@ -7,6 +7,7 @@ import (
 	"time"
 
 	"github.com/adshao/go-binance/v2/futures"
+	"golang.org/x/sync/errgroup"
 )
 
 func FetchLatestCandles(ctx context.Context, klineService KlineService, symbol string, interval string, limit int) ([]RestCandle, error) {
@@ -30,7 +31,17 @@ func FetchLatestCandles(ctx context.Context, klineService KlineService, symbol s
 	return data, nil
 }
 
+// historyFetchConcurrency caps in-flight kline requests per FetchHistoryByTime
+// call. Request pacing against the weight budget (5 per 1000-candle request) is
+// left to the WeightLimiter behind the client's HTTPClient.
+const historyFetchConcurrency = 4
+
+// FetchHistoryByTime returns every candle that opens in [startTime, endTime].
+// The range is split into 1000-candle windows up front and the windows are
+// fetched concurrently, then stitched back together in time order. The first
+// failing window cancels the rest, as does cancelling ctx.
 func FetchHistoryByTime(
+	ctx context.Context,
 	client *futures.Client,
 	symbol string,
 	interval string,
@@ -38,62 +49,59 @@ func FetchHistoryByTime(
 	endTime time.Time,
 ) ([]RestCandle, error) {
 
-	var allData []RestCandle
-	limit := 1000
-	currentStart := startTime.UnixMilli()
+	const limit = 1000
+	barDuration, err := ParseIntervalDuration(interval)
+	if err != nil {
+		return nil, fmt.Errorf("parse interval %q: %w", interval, err)
+	}
+	span := int64(limit) * barDuration.Milliseconds()
+	startMs := startTime.UnixMilli()
 	endMs := endTime.UnixMilli()
 
-	for {
-		ctx, cancel := context.WithTimeout(context.Background(), 10*time.Minute)
-
-		klines, err := client.NewKlinesService().
-			Symbol(symbol).
-			Interval(interval).
-			Limit(limit).
-			StartTime(currentStart).
-			EndTime(endMs).
-			Do(ctx)
-		cancel()
-
-		if err != nil {
-			return nil, err
-		}
-		if len(klines) == 0 {
-			break
-		}
-
-		for _, k := range klines {
-			op, _ := strconv.ParseFloat(k.Open, 64)
-			hi, _ := strconv.ParseFloat(k.High, 64)
-			lo, _ := strconv.ParseFloat(k.Low, 64)
-			cl, _ := strconv.ParseFloat(k.Close, 64)
-			vl, _ := strconv.ParseFloat(k.Volume, 64)
-
-			allData = append(allData, RestCandle{
-				Time:   k.OpenTime / 1000,
-				Open:   op,
-				High:   hi,
-				Low:    lo,
-				Close:  cl,
-				Volume: vl,
-			})
+	type window struct{ start, end int64 }
+	var windows []window
+	for s := startMs; s <= endMs; s += span {
+		e := s + span - 1
+		if e > endMs {
+			e = endMs
 		}
+		windows = append(windows, window{s, e})
+	}
 
-		// ถ้าได้น้อยกว่า limit = หมดแล้ว
-		if len(klines) < limit {
-			break
-		}
-
-		// เลื่อน startTime ไปต่อ
-		lastCandle := klines[len(klines)-1]
-		currentStart = lastCandle.OpenTime + 1
-
-		// ป้องกัน infinite loop
-		if currentStart >= endMs {
-			break
-		}
+	pages := make([][]RestCandle, len(windows))
+	g, gctx := errgroup.WithContext(ctx)
+	g.SetLimit(historyFetchConcurrency)
+	for i, w := range windows {
+		g.Go(func() error {
+			ctx, cancel := context.WithTimeout(gctx, 10*time.Minute)
+			defer cancel()
+
+			klines, err := client.NewKlinesService().
+				Symbol(symbol).
+				Interval(interval).
+				Limit(limit).
+				StartTime(w.start).
+				EndTime(w.end).
+				Do(ctx)
+			if err != nil {
+				return err
+			}
+
+			pages[i], err = parseKLinesToRestCandle(klines)
+			return err
+		})
+	}
+	if err := g.Wait(); err != nil {
+		return nil, err
+	}
 
-		time.Sleep(100 * time.Millisecond) // rate limit
+	total := 0
+	for _, p := range pages {
+		total += len(p)
+	}
+	allData := make([]RestCandle, 0, total)
+	for _, p := range pages {
+		allData = append(allData, p...)
 	}
 
 	return allData, nil
@@ -0,0 +1,165 @@
+package exchange
+
+import (
+	"context"
+	"net/http"
+	"net/url"
+	"strconv"
+	"strings"
+	"sync"
+	"time"
+)
+
+// FuturesWeightPerMinute is Binance USDⓈ-M futures' per-IP REST request-weight budget.
+const FuturesWeightPerMinute = 2400
+
+const (
+	// usedWeightHeader reports the weight this IP has used in the current minute.
+	usedWeightHeader = "X-MBX-USED-WEIGHT-1M"
+	// usedWeightHighWater is the share of the budget after which requests pause
+	// until the next minute window instead of risking a 429.
+	usedWeightHighWater = 0.9
+	// defaultRetryAfter is used when a 429/418 arrives without Retry-After.
+	defaultRetryAfter = time.Minute
+	// maxRateLimitRetries bounds how often one request is resent after a 429.
+	maxRateLimitRetries = 3
+)
+
+// WeightLimiter paces Binance REST requests against the per-minute weight budget.
+// One limiter is meant to be shared by every client hitting the same IP budget,
+// so running more symbols in parallel does not multiply the request rate.
+type WeightLimiter struct {
+	mu         sync.Mutex
+	perWeight  time.Duration // time for one unit of weight to refill
+	burst      time.Duration // how far reservations may run ahead of now without waiting
+	highWater  int           // used-weight header value that triggers a pause
+	next       time.Time     // when every reservation so far has refilled
+	pauseUntil time.Time     // set after a 429/418 or a high used-weight header
+}
+
+// NewWeightLimiter returns a limiter for weightPerMinute that allows a burst of
+// a tenth of the budget before it starts spacing requests out.
+func NewWeightLimiter(weightPerMinute int) *WeightLimiter {
+	perWeight := time.Minute / time.Duration(weightPerMinute)
+	return &WeightLimiter{
+		perWeight: perWeight,
+		burst:     time.Duration(weightPerMinute/10) * perWeight,
+		highWater: int(float64(weightPerMinute) * usedWeightHighWater),
+	}
+}
+
+// Wait blocks until a request of the given weight fits the budget or ctx is done.
+func (l *WeightLimiter) Wait(ctx context.Context, weight int) error {
+	l.mu.Lock()
+	now := time.Now()
+	start := l.next
+	if start.Before(now) {
+		start = now
+	}
+	l.next = start.Add(time.Duration(weight) * l.perWeight)
+	at := l.next.Add(-l.burst)
+	if at.Before(l.pauseUntil) {
+		at = l.pauseUntil
+	}
+	l.mu.Unlock()
+
+	d := time.Until(at)
+	if d <= 0 {
+		return nil
+	}
+	timer := time.NewTimer(d)
+	defer timer.Stop()
+	select {
+	case <-ctx.Done():
+		return ctx.Err()
+	case <-timer.C:
+		return nil
+	}
+}
+
+// pause holds every later request until t.
+func (l *WeightLimiter) pause(t time.Time) {
+	l.mu.Lock()
+	defer l.mu.Unlock()
+	if t.After(l.pauseUntil) {
+		l.pauseUntil = t
+	}
+	if l.next.Before(t) {
+		l.next = t
+	}
+}
+
+// observe backs off on rate-limit responses (429, or 418 once the IP is banned)
+// and when the used-weight header says the minute's budget is nearly spent.
+func (l *WeightLimiter) observe(resp *http.Response) {
+	switch resp.StatusCode {
+	case http.StatusTooManyRequests, http.StatusTeapot:
+		l.pause(time.Now().Add(retryAfter(resp.Header)))
+		return
+	}
+	used, err := strconv.Atoi(resp.Header.Get(usedWeightHeader))
+	if err == nil && used >= l.highWater {
+		// Binance counts weight per clock minute; wait for the next window.
+		l.pause(time.Now().Truncate(time.Minute).Add(time.Minute))
+	}
+}
+
+// HTTPClient returns a client whose requests all go through the limiter.
+func (l *WeightLimiter) HTTPClient() *http.Client {
+	return &http.Client{Transport: &weightTransport{base: http.DefaultTransport, limiter: l}}
+}
+
+type weightTransport struct {
+	base    http.RoundTripper
+	limiter *WeightLimiter
+}
+
+func (t *weightTransport) RoundTrip(req *http.Request) (*http.Response, error) {
+	weight := requestWeight(req.URL)
+	// Only body-less requests (klines and other GETs) can be resent as-is.
+	retryable := req.Body == nil || req.Body == http.NoBody
+	for attempt := 0; ; attempt++ {
+		if err := t.limiter.Wait(req.Context(), weight); err != nil {
+			return nil, err
+		}
+		resp, err := t.base.RoundTrip(req)
+		if err != nil {
+			return nil, err
+		}
+		t.limiter.observe(resp)
+		if resp.StatusCode != http.StatusTooManyRequests || !retryable || attempt == maxRateLimitRetries {
+			return resp, nil
+		}
+		resp.Body.Close()
+	}
+}
+
+// requestWeight is the weight Binance charges for a request. Futures klines
+// scale with limit (default 500); everything else this client sends costs 1.
+func requestWeight(u *url.URL) int {
+	if !strings.HasSuffix(u.Path, "/klines") {
+		return 1
+	}
+	limit, err := strconv.Atoi(u.Query().Get("limit"))
+	if err != nil {
+		limit = 500
+	}
+	switch {
+	case limit < 100:
+		return 1
+	case limit < 500:
+		return 2
+	case limit <= 1000:
+		return 5
+	default:
+		return 10
+	}
+}
+
+// retryAfter reads Retry-After in seconds, falling back to defaultRetryAfter.
+func retryAfter(h http.Header) time.Duration {
+	if s, err := strconv.Atoi(h.Get("Retry-After")); err == nil && s >= 0 {
+		return time.Duration(s) * time.Second
+	}
+	return defaultRetryAfter
+}
@@ -0,0 +1,102 @@
+package exchange
+
+import (
+	"context"
+	"net/http"
+	"net/http/httptest"
+	"net/url"
+	"testing"
+	"time"
+
+	"github.com/stretchr/testify/assert"
+)
+
+func TestRequestWeight_KlinesScaleWithLimit(t *testing.T) {
+	// Arrange
+	cases := map[string]int{
+		"/fapi/v1/klines?limit=99":   1,
+		"/fapi/v1/klines?limit=100":  2,
+		"/fapi/v1/klines?limit=1000": 5,
+		"/fapi/v1/klines?limit=1500": 10,
+		"/fapi/v1/klines":            5,
+		"/fapi/v1/time":              1,
+	}
+
+	for raw, want := range cases {
+		u, err := url.Parse(raw)
+		assert.NoError(t, err)
+
+		// Act
+		got := requestWeight(u)
+
+		// Assert
+		assert.Equal(t, want, got, raw)
+	}
+}
+
+func TestWeightLimiterWait_PastBurst_SpacesRequests(t *testing.T) {
+	// Arrange: 10ms per unit of weight, burst of 600 weight.
+	l := NewWeightLimiter(6000)
+	assert.NoError(t, l.Wait(context.Background(), 600))
+
+	// Act
+	start := time.Now()
+	err := l.Wait(context.Background(), 5)
+
+	// Assert
+	assert.NoError(t, err)
+	assert.GreaterOrEqual(t, time.Since(start), 40*time.Millisecond)
+}
+
+func TestWeightLimiterWait_CancelledContext_ReturnsError(t *testing.T) {
+	// Arrange
+	l := NewWeightLimiter(FuturesWeightPerMinute)
+	l.pause(time.Now().Add(time.Hour))
+	ctx, cancel := context.WithCancel(context.Background())
+	cancel()
+
+	// Act
+	err := l.Wait(ctx, 1)
+
+	// Assert
+	assert.ErrorIs(t, err, context.Canceled)
+}
+
+func TestWeightLimiterObserve_HighUsedWeight_PausesToNextMinute(t *testing.T) {
+	// Arrange
+	l := NewWeightLimiter(FuturesWeightPerMinute)
+	resp := &http.Response{StatusCode: http.StatusOK, Header: http.Header{}}
+	resp.Header.Set(usedWeightHeader, "2300")
+
+	// Act
+	l.observe(resp)
+
+	// Assert
+	assert.True(t, l.pauseUntil.After(time.Now()))
+	assert.Equal(t, l.pauseUntil, l.pauseUntil.Truncate(time.Minute))
+}
+
+func TestWeightLimiterHTTPClient_429_RetriesAfterBackoff(t *testing.T) {
+	// Arrange
+	calls := 0
+	srv := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		calls++
+		if calls == 1 {
+			w.Header().Set("Retry-After", "0")
+			w.WriteHeader(http.StatusTooManyRequests)
+			return
+		}
+		w.WriteHeader(http.StatusOK)
+	}))
+	defer srv.Close()
+	client := NewWeightLimiter(FuturesWeightPerMinute).HTTPClient()
+
+	// Act
+	resp, err := client.Get(srv.URL + "/fapi/v1/klines?limit=1000")
+
+	// Assert
+	assert.NoError(t, err)
+	defer resp.Body.Close()
+	assert.Equal(t, http.StatusOK, resp.StatusCode)
+	assert.Equal(t, 2, calls)
+}
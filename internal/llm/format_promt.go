@@ -78,8 +78,7 @@ func FormatPatternMatches(matches []HistoricalDetail) string {
 	bestOutcome := ""
 
 	for _, m := range matches {
-		var sim float64
-		fmt.Sscanf(strings.TrimSuffix(m.Similarity, "%"), "%f", &sim)
+		sim := m.SimilarityPct
 
 		if sim > bestSim {
 			bestSim = sim
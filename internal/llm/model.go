@@ -10,12 +10,13 @@ type PnLData struct {
 }
 
 type HistoricalDetail struct {
-	Time            string `json:"time"`
-	TrendSlope      string `json:"trend_slope"`
-	TrendOutcome    string `json:"trend_outcome"`
-	ImmediateReturn string `json:"immediate_return"`
-	Distance        string `json:"distance"`         // <--- Added
-	Similarity      string `json:"similarity_score"` // <--- Added
+	Time            string  `json:"time"`
+	TrendSlope      string  `json:"trend_slope"`
+	TrendOutcome    string  `json:"trend_outcome"`
+	ImmediateReturn string  `json:"immediate_return"`
+	Distance        string  `json:"distance"`         // <--- Added
+	Similarity      string  `json:"similarity_score"` // <--- Added
+	SimilarityPct   float64 `json:"-"`                // numeric Similarity, avoids re-parsing the string
 }
 
 type TradeSignal struct {
@@ -6,10 +6,9 @@ import (
 	"encoding/base64"
 	"encoding/json"
 	"fmt"
-	"io/ioutil"
+	"io"
 	"log"
 	"net/http"
-	"os"
 	"strings"
 	"sync/atomic"
 	"time"
@@ -28,6 +27,54 @@ const (
 // --- Structs for JSON Response ---
 // This matches the "OUTPUT FORMAT" in your system prompt exactly
 
+// --- Structs for the Messages API ---
+// Typed request/response so encoding/json walks fixed struct fields instead of
+// reflecting over nested maps (the request carries a large base64 image).
+
+type cacheControl struct {
+	Type string `json:"type"`
+	TTL  string `json:"ttl"`
+}
+
+type textBlock struct {
+	Type         string        `json:"type"`
+	Text         string        `json:"text"`
+	CacheControl *cacheControl `json:"cache_control,omitempty"`
+}
+
+type imageSource struct {
+	Type      string `json:"type"`
+	MediaType string `json:"media_type"`
+	Data      string `json:"data"`
+}
+
+type contentBlock struct {
+	Type   string       `json:"type"`
+	Text   string       `json:"text,omitempty"`
+	Source *imageSource `json:"source,omitempty"`
+}
+
+type message struct {
+	Role    string         `json:"role"`
+	Content []contentBlock `json:"content"`
+}
+
+type messagesRequest struct {
+	Model       string      `json:"model"`
+	MaxTokens   int         `json:"max_tokens"`
+	System      []textBlock `json:"system"`
+	Messages    []message   `json:"messages"`
+	Temperature float64     `json:"temperature"`
+}
+
+type messagesResponse struct {
+	Content []contentBlock `json:"content"`
+	Usage   struct {
+		InputTokens  int64 `json:"input_tokens"`
+		OutputTokens int64 `json:"output_tokens"`
+	} `json:"usage"`
+}
+
 // --- Service ---
 type LLMService struct {
 	ApiKey         string
@@ -38,9 +85,15 @@ type LLMService struct {
 }
 
 func NewLLMService(apiKey string, maxDailyTokens int) *LLMService {
+	// Own transport so the TLS connection to the API stays warm between
+	// signals instead of competing with other users of DefaultTransport.
+	transport := http.DefaultTransport.(*http.Transport).Clone()
+	transport.MaxIdleConnsPerHost = 10
+	transport.IdleConnTimeout = 5 * time.Minute
+
 	return &LLMService{
 		ApiKey:         apiKey,
-		Client:         &http.Client{Timeout: 60 * time.Second},
+		Client:         &http.Client{Timeout: 60 * time.Second, Transport: transport},
 		MaxDailyTokens: maxDailyTokens,
 	}
 }
@@ -54,62 +107,45 @@ func (s *LLMService) resetDailyTokensIfNeeded() {
 }
 
 // 1. GenerateTradingPrompt mirrors your Python logic:
-//   - Calculates Slope Statistics (Consensus)
 //   - Injects the "Skeptical Risk Manager" System Prompt
 //   - Prepares the Multimodal User Content
 func (s *LLMService) GenerateTradingPrompt(
 	currentTime string,
 	matches []embedding.PatternLabel,
 	matches1h []embedding.PatternLabel,
-	chartPathCandel string,
+	chartPNG []byte,
 	pnlData []trade.PositionHistory,
 	regimes map[string]exchange.IntervalRegime,
 	dailyPnL float64,
 	symbol string,
 ) (string, string, string, error) {
 
-	var cleanData []HistoricalDetail
-	var cleanData1H []HistoricalDetail
-	var slopes []float64
-	var slopes1H []float64
+	cleanData := toHistoricalDetails(matches)
+	cleanData1H := toHistoricalDetails(matches1h)
 
-	for _, m := range matches {
-		slope := m.NextSlope3
-		if slope == 0 {
-			slope = m.NextSlope5
-		}
-		slopes = append(slopes, slope)
+	// historicalJson, _ := json.MarshalIndent(cleanData, "", "  ")
 
-		trendDir := "DOWN"
-		if slope > 0 {
-			trendDir = "UP"
-		}
+	systemMessage := GetBasePrompt(symbol)
+	systemMessage += GetPromptConstraint()
 
-		// Calculate basic similarity % (1.0 - Distance)
-		// Distance usually 0.0 to 1.0 (Cosine Distance)
-		// If Distance is > 1.0 (Euclidean), this might need adjustment,
-		// but for Cosine, (1-Dist)*100 is a good proxy.
-		simScore := (1.0 - m.Distance) * 100
-		if simScore < 0 {
-			simScore = 0
-		}
+	regime4h := regimes["4h"].Result
+	regime1d := regimes["1d"].Result
+	userContent := FormatUserPrompt(pnlData, regime4h, regime1d, cleanData, cleanData1H, dailyPnL)
 
-		cleanData = append(cleanData, HistoricalDetail{
-			Time:            m.Time.Format("2006-01-02 15:04"),
-			TrendSlope:      fmt.Sprintf("%.6f", slope),
-			TrendOutcome:    trendDir,
-			ImmediateReturn: fmt.Sprintf("%.4f%%", m.NextReturn*100),
-			Distance:        fmt.Sprintf("%.4f", m.Distance), // <--- Populated
-			Similarity:      fmt.Sprintf("%.1f%%", simScore), // <--- Populated
-		})
-	}
+	b64Canle := base64.StdEncoding.EncodeToString(chartPNG)
 
-	for _, m := range matches1h {
+	return systemMessage, userContent, b64Canle, nil
+}
+
+// toHistoricalDetails formats pattern matches for the prompt.
+func toHistoricalDetails(matches []embedding.PatternLabel) []HistoricalDetail {
+	details := make([]HistoricalDetail, 0, len(matches))
+
+	for _, m := range matches {
 		slope := m.NextSlope3
 		if slope == 0 {
 			slope = m.NextSlope5
 		}
-		slopes1H = append(slopes1H, slope)
 
 		trendDir := "DOWN"
 		if slope > 0 {
@@ -120,49 +156,19 @@ func (s *LLMService) GenerateTradingPrompt(
 		// Distance usually 0.0 to 1.0 (Cosine Distance)
 		// If Distance is > 1.0 (Euclidean), this might need adjustment,
 		// but for Cosine, (1-Dist)*100 is a good proxy.
-		simScore := (1.0 - m.Distance) * 100
-		if simScore < 0 {
-			simScore = 0
-		}
+		simScore := m.SimilarityPct()
 
-		cleanData1H = append(cleanData1H, HistoricalDetail{
+		details = append(details, HistoricalDetail{
 			Time:            m.Time.Format("2006-01-02 15:04"),
 			TrendSlope:      fmt.Sprintf("%.6f", slope),
 			TrendOutcome:    trendDir,
 			ImmediateReturn: fmt.Sprintf("%.4f%%", m.NextReturn*100),
-			Distance:        fmt.Sprintf("%.4f", m.Distance), // <--- Populated
-			Similarity:      fmt.Sprintf("%.1f%%", simScore), // <--- Populated
+			Distance:        fmt.Sprintf("%.4f", m.Distance),
+			Similarity:      fmt.Sprintf("%.1f%%", simScore),
+			SimilarityPct:   simScore,
 		})
 	}
-
-	// Calculate Consensus
-	avgSlope := 0.0
-	positiveTrends := 0
-	for _, s := range slopes {
-		avgSlope += s
-		if s > 0 {
-			positiveTrends++
-		}
-	}
-	if len(slopes) > 0 {
-		avgSlope /= float64(len(slopes))
-	}
-
-	// historicalJson, _ := json.MarshalIndent(cleanData, "", "  ")
-
-	systemMessage := GetBasePrompt(symbol)
-	systemMessage += GetPromptConstraint()
-
-	regime4h := regimes["4h"].Result
-	regime1d := regimes["1d"].Result
-	userContent := FormatUserPrompt(pnlData, regime4h, regime1d, cleanData, cleanData1H, dailyPnL)
-
-	b64Canle, err := encodeImage(chartPathCandel)
-	if err != nil {
-		return "", "", "", err
-	}
-
-	return systemMessage, userContent, b64Canle, nil
+	return details
 }
 
 // 2. GenerateSignal executes the request
@@ -173,39 +179,22 @@ func (s *LLMService) GenerateSignal(ctx context.Context, systemPrompt, userText,
 	}
 
 	// Construct Payload matching Anthropic Messages API spec
-	payload := map[string]interface{}{
-		"model":      MODEL_NAME,
-		"max_tokens": 1000,
-		"system": []map[string]interface{}{
-			{
-				"type": "text",
-				"text": systemPrompt,
-				"cache_control": map[string]string{
-					"type": "ephemeral",
-					"ttl":  "1h",
-				},
-			},
-		},
-		"messages": []map[string]interface{}{
-			{
-				"role": "user",
-				"content": []map[string]interface{}{
-					{
-						"type": "text",
-						"text": userText,
-					},
-					{
-						"type": "image",
-						"source": map[string]string{
-							"type":       "base64",
-							"media_type": "image/png",
-							"data":       imgB_B64,
-						},
-					},
-				},
+	payload := messagesRequest{
+		Model:     MODEL_NAME,
+		MaxTokens: 1000,
+		System: []textBlock{{
+			Type:         "text",
+			Text:         systemPrompt,
+			CacheControl: &cacheControl{Type: "ephemeral", TTL: "1h"},
+		}},
+		Messages: []message{{
+			Role: "user",
+			Content: []contentBlock{
+				{Type: "text", Text: userText},
+				{Type: "image", Source: &imageSource{Type: "base64", MediaType: "image/png", Data: imgB_B64}},
 			},
-		},
-		"temperature": 0.1,
+		}},
+		Temperature: 0.1,
 	}
 
 	jsonBytes, _ := json.Marshal(payload)
@@ -225,40 +214,33 @@ func (s *LLMService) GenerateSignal(ctx context.Context, systemPrompt, userText,
 	defer resp.Body.Close()
 
 	if resp.StatusCode != 200 {
-		body, _ := ioutil.ReadAll(resp.Body)
+		body, _ := io.ReadAll(resp.Body)
 		return nil, fmt.Errorf("API Error %d: %s", resp.StatusCode, string(body))
 	}
 
 	// Parse Response
-	var result map[string]interface{}
+	var result messagesResponse
 	if err := json.NewDecoder(resp.Body).Decode(&result); err != nil {
 		return nil, err
 	}
 
 	// Accumulate token usage for daily budget tracking
-	if usage, ok := result["usage"].(map[string]interface{}); ok {
-		in, _ := usage["input_tokens"].(float64)
-		out, _ := usage["output_tokens"].(float64)
-		used := int64(in + out)
-		total := s.dailyTokens.Add(used)
-		log.Printf("[LLMService] tokens this call: %d | daily total: %d", used, total)
-	}
+	used := result.Usage.InputTokens + result.Usage.OutputTokens
+	total := s.dailyTokens.Add(used)
+	log.Printf("[LLMService] tokens this call: %d | daily total: %d", used, total)
 
 	// Safely extract content (Anthropic format: content[0].text)
-	contentBlocks, ok := result["content"].([]interface{})
-	if !ok || len(contentBlocks) == 0 {
+	if len(result.Content) == 0 {
 		return nil, fmt.Errorf("invalid response format from LLM")
 	}
-	firstBlock := contentBlocks[0].(map[string]interface{})
-	contentStr, ok := firstBlock["text"].(string)
-	if !ok {
-		return nil, fmt.Errorf("unexpected content block type: %v", firstBlock["type"])
+	firstBlock := result.Content[0]
+	if firstBlock.Type != "text" {
+		return nil, fmt.Errorf("unexpected content block type: %v", firstBlock.Type)
 	}
+	contentStr := firstBlock.Text
 
 	// Clean JSON (remove markdown ticks)
-	contentStr = strings.ReplaceAll(contentStr, "```json", "")
-	contentStr = strings.ReplaceAll(contentStr, "```", "")
-	contentStr = strings.TrimSpace(contentStr)
+	contentStr = stripJSONFence(contentStr)
 
 	// Unmarshal
 	var signal TradeSignal
@@ -270,11 +252,15 @@ func (s *LLMService) GenerateSignal(ctx context.Context, systemPrompt, userText,
 	return &signal, nil
 }
 
-// Helper
-func encodeImage(path string) (string, error) {
-	bytes, err := os.ReadFile(path)
-	if err != nil {
-		return "", err
+// stripJSONFence removes a ```json ... ``` wrapper. Most responses are raw JSON,
+// so anything that does not start with a fence is only trimmed.
+func stripJSONFence(s string) string {
+	s = strings.TrimSpace(s)
+	if !strings.HasPrefix(s, "```") {
+		return s
 	}
-	return base64.StdEncoding.EncodeToString(bytes), nil
+	s = strings.TrimPrefix(s, "```json")
+	s = strings.TrimPrefix(s, "```")
+	s = strings.TrimSuffix(s, "```")
+	return strings.TrimSpace(s)
 }
@@ -6,52 +6,63 @@ import (
 	"log/slog"
 	"time"
 	"time-series-rag-agent/config"
+	"time-series-rag-agent/internal/embedding"
 	"time-series-rag-agent/internal/exchange"
 	"time-series-rag-agent/internal/storage/postgresql"
 
 	"github.com/adshao/go-binance/v2/futures"
 )
 
-func NewBackfillPipeline(ctx context.Context, logger *slog.Logger, symbol string, interval string, limit int, vectorWindow int, dayLookback int) error {
+// labelLookahead is the furthest label horizon (next_slope_5) in candles.
+const labelLookahead = 5
+
+// NewBackfillPipeline fetches history for one symbol/interval and writes it through db.
+// The store and the REST weight limiter are owned by the caller, so one pool and one
+// request-weight budget are shared across every backfill run.
+func NewBackfillPipeline(ctx context.Context, logger *slog.Logger, db *postgresql.PatternStore, limiter *exchange.WeightLimiter, symbol string, interval string, limit int, vectorWindow int, dayLookback int) error {
 	logger.Info("[BackfillPipeline] Starting Embedding Pipeline")
 	cfg := config.LoadConfig()
 	binanceClient := futures.NewClient(cfg.Market.ApiKey, cfg.Market.ApiSecret)
+	binanceClient.HTTPClient = limiter.HTTPClient()
 
 	endTime := time.Now()
 	startTime := endTime.AddDate(0, 0, -dayLookback)
-	restCandle, err := exchange.FetchHistoryByTime(binanceClient, symbol, interval, startTime, endTime)
-	if err != nil {
-		logger.Error(fmt.Sprintf("[BackfillPipeline] REST candle fetch: %v", err))
-		return err
-	}
-
-	feature, label := NewBackfillEmbeddingPipeline(*logger, restCandle, symbol, interval, vectorWindow)
 
-	connString := fmt.Sprintf("postgres://%s:%s@%s:%d/%s",
-		cfg.Database.DBUser,
-		cfg.Database.DBPassword,
-		cfg.Database.DBHost,
-		cfg.Database.DBPort,
-		cfg.Database.DBName,
-	)
-	db, err := postgresql.NewPostgresDB(ctx, connString, *logger)
+	// Resume from what is already stored: re-fetch only the feature window and
+	// label horizon behind the newest row so its pending labels get filled in.
+	latest, ok, err := db.LatestTime(ctx, symbol, interval)
 	if err != nil {
-		logger.Error(fmt.Sprintf("[BackfillPipeline] DB connection: %v", err))
+		logger.Error(fmt.Sprintf("[BackfillPipeline] latest time: %v", err))
 		return err
 	}
-	defer db.Close()
-
-	if err := db.BulkUpsertFeature(ctx, feature); err != nil {
-		logger.Error(fmt.Sprintf("[BackfillPipeline] BulkUpsertFeature: %v", err))
+	if ok {
+		barDuration, err := exchange.ParseIntervalDuration(interval)
+		if err != nil {
+			return fmt.Errorf("[BackfillPipeline] parse interval: %w", err)
+		}
+		resumeFrom := time.Unix(latest, 0).Add(-time.Duration(vectorWindow+labelLookahead) * barDuration)
+		if resumeFrom.After(startTime) {
+			logger.Info(fmt.Sprintf("[BackfillPipeline] resuming %s %s from %s", symbol, interval, resumeFrom.UTC().Format(time.RFC3339)))
+			startTime = resumeFrom
+		}
+	}
+	restCandle, err := exchange.FetchHistoryByTime(ctx, binanceClient, symbol, interval, startTime, endTime)
+	if err != nil {
+		logger.Error(fmt.Sprintf("[BackfillPipeline] REST candle fetch: %v", err))
 		return err
 	}
-	logger.Info("[BackfillPipeline] Ingested feature")
 
-	if err := db.UpsertLabels(ctx, symbol, interval, label); err != nil {
-		logger.Error(fmt.Sprintf("[BackfillPipeline] UpsertLabels: %v", err))
+	// Each chunk commits on its own; if one fails, LatestTime resumes after the last committed chunk.
+	total, err := NewBackfillEmbeddingPipeline(*logger, restCandle, symbol, interval, vectorWindow,
+		func(batch *embedding.PatternBatch) error {
+			return db.BulkUpsertPatternBatch(ctx, batch)
+		},
+	)
+	if err != nil {
+		logger.Error(fmt.Sprintf("[BackfillPipeline] BulkUpsertPatternBatch after %d rows: %v", total, err))
 		return err
 	}
-	logger.Info("[BackfillPipeline] Ingested label")
+	logger.Info(fmt.Sprintf("[BackfillPipeline] Ingested %d rows", total))
 
 	return nil
 }
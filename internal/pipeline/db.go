@@ -0,0 +1,15 @@
+package pipeline
+
+import (
+	"fmt"
+
+	"time-series-rag-agent/config"
+)
+
+// DBConnString builds the postgres connection URL from the database config.
+func DBConnString(dbConfig config.DatabaseConfig) string {
+	return fmt.Sprintf("postgres://%s:%s@%s:%d/%s",
+		dbConfig.DBUser, dbConfig.DBPassword,
+		dbConfig.DBHost, dbConfig.DBPort, dbConfig.DBName,
+	)
+}
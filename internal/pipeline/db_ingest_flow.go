@@ -4,8 +4,9 @@ import (
 	"context"
 	"fmt"
 	"log/slog"
+	"sync"
+	"time"
 
-	"time-series-rag-agent/config"
 	"time-series-rag-agent/internal/embedding"
 	"time-series-rag-agent/internal/exchange"
 	"time-series-rag-agent/internal/storage/postgresql"
@@ -13,66 +14,38 @@ import (
 	"golang.org/x/sync/errgroup"
 )
 
-func RestIngestVectorFlow(logger *slog.Logger, symbol string, interval string, vectorSize int) error {
-	logger.Info("[RestIngestVectorFlow] Start multiple ingest data")
-
-	cfg := config.LoadConfig()
-	connString := fmt.Sprintf("postgres://%s:%s@%s:%d/%s",
-		cfg.Database.DBUser, cfg.Database.DBPassword,
-		cfg.Database.DBHost, cfg.Database.DBPort, cfg.Database.DBName,
-	)
-
-	ctx := context.Background()
+// lastIngested holds the newest closed candle time already ingested per
+// "symbol|interval". The live pipeline calls RestIngestVectorFlow for 1h on every
+// 15m bar, but the closed 1h window only changes once an hour.
+var lastIngested sync.Map
 
-	// ── Phase 1: DB connect + Fetch candles (concurrent) ──
-	var (
-		dbIngest     *postgresql.PatternStore
-		wsRestCandle []exchange.WsRestCandle
-	)
-
-	g1, ctx1 := errgroup.WithContext(ctx)
+// RestIngestVectorFlow fetches the latest closed candles for symbol/interval and
+// upserts the newest feature and its labels. The kline client and the store are
+// owned by the caller, so repeated calls reuse one HTTP client and one pool.
+func RestIngestVectorFlow(ctx context.Context, logger *slog.Logger, adapter exchange.KlineService, dbIngest *postgresql.PatternStore, symbol string, interval string, vectorSize int) error {
+	logger.Info("[RestIngestVectorFlow] Start multiple ingest data")
 
-	g1.Go(func() error {
-		var err error
-		dbIngest, err = postgresql.NewPostgresDB(ctx1, connString, *logger)
-		if err != nil {
-			return fmt.Errorf("connect db: %w", err)
-		}
-		logger.Info("[RestIngestVectorFlow] DB connected")
-		return nil
-	})
+	duration, err := exchange.ParseIntervalDuration(interval)
+	if err != nil {
+		return fmt.Errorf("[RestIngestVectorFlow] parse interval %q: %w", interval, err)
+	}
+	intervalSecs := int64(duration.Seconds())
+	lastClosed := exchange.SnapToInterval(time.Now().Unix(), intervalSecs) - intervalSecs
 
-	g1.Go(func() error {
-		binanceClient, err := exchange.NewBinanceClient(ctx1, cfg)
-		if err != nil {
-			return fmt.Errorf("new binance client: %w", err)
-		}
-		adapter := exchange.NewBinanceAdapter(binanceClient)
-
-		restCandle, err := exchange.FetchLatestCandles(ctx1, adapter, symbol, interval, vectorSize+1+99)
-		if err != nil {
-			return fmt.Errorf("fetch candles: %w", err)
-		}
-
-		wsRestCandle = make([]exchange.WsRestCandle, len(restCandle))
-		for i, c := range restCandle {
-			wsRestCandle[i] = exchange.WsRestCandle{
-				Time:   c.Time,
-				Open:   c.Open,
-				High:   c.High,
-				Low:    c.Low,
-				Close:  c.Close,
-				Volume: c.Volume,
-			}
-		}
-		logger.Info("[RestIngestVectorFlow] Candles fetched", "count", len(wsRestCandle))
+	key := symbol + "|" + interval
+	if v, ok := lastIngested.Load(key); ok && v.(int64) >= lastClosed {
+		logger.Info("[RestIngestVectorFlow] Latest closed candle already ingested, skipping", "symbol", symbol, "interval", interval, "time", v)
 		return nil
-	})
+	}
 
-	if err := g1.Wait(); err != nil {
-		return fmt.Errorf("[RestIngestVectorFlow] phase 1: %w", err)
+	// ── Phase 1: Fetch candles ──
+	restCandle, err := exchange.FetchLatestCandles(ctx, adapter, symbol, interval, vectorSize+1+99)
+	if err != nil {
+		return fmt.Errorf("[RestIngestVectorFlow] fetch candles: %w", err)
 	}
-	defer dbIngest.Close()
+
+	wsRestCandle := exchange.ToWsRestCandles(restCandle)
+	logger.Info("[RestIngestVectorFlow] Candles fetched", "count", len(wsRestCandle))
 
 	// ── Phase 2: Calculate feature + label (concurrent) ──
 	var (
@@ -100,16 +73,13 @@ func RestIngestVectorFlow(logger *slog.Logger, symbol string, interval string, v
 		return fmt.Errorf("[RestIngestVectorFlow] phase 2: %w", err)
 	}
 
-	// ── Phase 3: Upsert to DB (sequential — same table, avoid row lock conflict) ──
-	if err := dbIngest.UpsertFeature(ctx, *feature); err != nil {
-		return fmt.Errorf("[RestIngestVectorFlow] upsert feature: %w", err)
+	// ── Phase 3: Upsert to DB (one batch — feature first, then labels) ──
+	if err := dbIngest.UpsertFeatureWithLabels(ctx, *feature, label); err != nil {
+		return fmt.Errorf("[RestIngestVectorFlow] upsert feature and labels: %w", err)
 	}
-	logger.Info("[RestIngestVectorFlow] Ingested feature")
+	logger.Info("[RestIngestVectorFlow] Ingested feature and label")
 
-	if err := dbIngest.UpsertLabels(ctx, symbol, interval, label); err != nil {
-		return fmt.Errorf("[RestIngestVectorFlow] upsert labels: %w", err)
-	}
-	logger.Info("[RestIngestVectorFlow] Ingested label")
+	lastIngested.Store(key, wsRestCandle[len(wsRestCandle)-1].Time)
 
 	logger.Info("[RestIngestVectorFlow] Success ingested")
 	return nil
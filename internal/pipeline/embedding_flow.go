@@ -1,6 +1,7 @@
 package pipeline
 
 import (
+	"fmt"
 	"log/slog"
 
 	"time-series-rag-agent/internal/embedding"
@@ -30,55 +31,89 @@ func NewEmbeddingPipeline(
 	return feature, label, wsRestCandle
 }
 
+// backfillChunkSize is how many rows NewBackfillEmbeddingPipeline builds before
+// handing them to flush, so peak memory stays bounded by the chunk, not the history.
+const backfillChunkSize = 8192
+
+// NewBackfillEmbeddingPipeline computes features and labels for every candle
+// with a full window behind it and passes them to flush one chunk at a time.
+// It returns the number of rows flushed.
 func NewBackfillEmbeddingPipeline(
 	logger slog.Logger,
 	restCandles []exchange.RestCandle,
 	symbol string,
 	interval string,
 	vectorWindow int,
-) ([]embedding.PatternFeature, []embedding.LabelUpdate) {
+	flush func(*embedding.PatternBatch) error,
+) (int, error) {
 	logger.Info("[EmbeddingPipeline] Starting Backfill Pipeline")
+	if vectorWindow <= 0 {
+		return 0, fmt.Errorf("[EmbeddingPipeline] vector window must be positive, got %d", vectorWindow)
+	}
 
 	fc := embedding.NewFeatureCalculator(symbol, interval, vectorWindow)
 	lc := embedding.NewLabelCalculator()
 
-	// Convert once
-	inputData := make([]exchange.WsRestCandle, len(restCandles))
+	// Only time and close are needed; pull them out as columns once and
+	// hand sub-slices to the calculators instead of copying candles.
+	n := len(restCandles)
+	times := make([]int64, n)
+	closes := make([]float64, n)
 	for i, c := range restCandles {
-		inputData[i] = exchange.WsRestCandle{
-			Time: c.Time, Open: c.Open, High: c.High,
-			Low: c.Low, Close: c.Close, Volume: c.Volume,
-		}
+		times[i] = c.Time
+		closes[i] = c.Close
 	}
 
-	var features []embedding.PatternFeature
-	var labels []embedding.LabelUpdate
+	// Rows are candles [start, end). Features need vectorWindow candles before
+	// start; labels need labelLookahead candles after end.
+	buildChunk := func(start int) *embedding.PatternBatch {
+		end := start + backfillChunkSize
+		if end > n {
+			end = n
+		}
+		lookEnd := end + labelLookahead
+		if lookEnd > n {
+			lookEnd = n
+		}
 
-	for i := vectorWindow; i < len(inputData); i++ {
-		feature := fc.Calculate(inputData[i-vectorWindow : i+1])
-		if feature == nil {
-			continue
+		nextReturn, nextSlope3, nextSlope5 := lc.LookaheadColumnsFromCloses(closes[start-vectorWindow:lookEnd], vectorWindow)
+		rows := end - start
+		return &embedding.PatternBatch{
+			Symbol:     symbol,
+			Interval:   interval,
+			Time:       times[start:end],
+			ClosePrice: closes[start:end],
+			Embedding:  fc.BulkEmbeddings(closes[start-vectorWindow : end]),
+			NextReturn: nextReturn[:rows],
+			NextSlope3: nextSlope3[:rows],
+			NextSlope5: nextSlope5[:rows],
 		}
-		features = append(features, *feature)
-		labels = append(labels, lc.CalculateLookahead(inputData, i, feature.Time.Unix())...)
 	}
 
-	return features, labels
-}
-
-func NewEmbeddingFeaturePipeline(
-	logger slog.Logger,
-	wsCandle []exchange.WsCandle,
-	restCandle []exchange.RestCandle,
-	vectorSize int,
-	symbol string,
-	interval string,
-) *embedding.PatternFeature {
-	logger.Info("[EmbeddingPipeline] Starting Embedding Pipeline")
-	// -- Features -- //
-	fc := embedding.NewFeatureCalculator(symbol, interval, vectorSize)
+	// The next chunk is computed while the current one is being flushed, so
+	// CPU work overlaps the DB round trip. The channel holds one chunk, which
+	// keeps memory bounded to a few chunks.
+	batches := make(chan *embedding.PatternBatch, 1)
+	stop := make(chan struct{})
+	defer close(stop)
+	go func() {
+		defer close(batches)
+		for start := vectorWindow; start < n; start += backfillChunkSize {
+			select {
+			case batches <- buildChunk(start):
+			case <-stop:
+				return
+			}
+		}
+	}()
 
-	feature := fc.CalculateRest(restCandle)
+	total := 0
+	for batch := range batches {
+		if err := flush(batch); err != nil {
+			return total, err
+		}
+		total += batch.Len()
+	}
 
-	return feature
+	return total, nil
 }
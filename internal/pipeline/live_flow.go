@@ -4,7 +4,6 @@ import (
 	"context"
 	"fmt"
 	"log/slog"
-	"strings"
 	"sync"
 	"time"
 	"time-series-rag-agent/config"
@@ -18,17 +17,15 @@ import (
 	"golang.org/x/sync/errgroup"
 )
 
-func NewLivePipeline(ctx context.Context, logger *slog.Logger, binanceClient *futures.Client, hooks *pkg.PipelineHooks, wsCandle []exchange.WsCandle, symbol string, interval string, vectorSize int, wsClose float64) error {
+// NewLivePipeline runs one bar for symbol. restCandle may carry candles the caller
+// already fetched for this bar (e.g. from SelectBestOpportunity); when it is empty
+// they are fetched here. dbIngest is owned by the caller and shared across bars.
+func NewLivePipeline(ctx context.Context, logger *slog.Logger, binanceClient *futures.Client, hooks *pkg.PipelineHooks, dbIngest *postgresql.PatternStore, wsCandle []exchange.WsCandle, restCandle []exchange.RestCandle, symbol string, interval string, vectorSize int, wsClose float64) error {
 	logger.Info("[LivePipeline] Starting Embedding Pipeline")
 	cfg := config.LoadConfig()
 	adapter := exchange.NewBinanceAdapter(binanceClient)
 
-	connString := fmt.Sprintf("postgres://%s:%s@%s:%d/%s",
-		cfg.Database.DBUser, cfg.Database.DBPassword,
-		cfg.Database.DBHost, cfg.Database.DBPort, cfg.Database.DBName,
-	)
-
-	duration, err := parseBinanceInterval(interval)
+	duration, err := exchange.ParseIntervalDuration(interval)
 	if err != nil {
 		return fmt.Errorf("[LivePipeline] parse interval: %w", err)
 	}
@@ -43,27 +40,21 @@ func NewLivePipeline(ctx context.Context, logger *slog.Logger, binanceClient *fu
 		*logger,
 	)
 
-	// --- 1) REST fetch + DB connect + Cooldown check in parallel (fail-fast) ---
+	// --- 1) REST fetch + Cooldown check in parallel (fail-fast) ---
 	var (
-		restCandle    []exchange.RestCandle
-		dbIngest      *postgresql.PatternStore
 		isInCooldown  bool
 		barsRemaining int
 	)
 
 	g1, ctx1 := errgroup.WithContext(ctx)
 
-	g1.Go(func() error {
-		var err error
-		restCandle, err = exchange.FetchLatestCandles(ctx1, adapter, symbol, interval, vectorSize+1+99)
-		return err
-	})
-
-	g1.Go(func() error {
-		var err error
-		dbIngest, err = postgresql.NewPostgresDB(ctx1, connString, *logger)
-		return err
-	})
+	if len(restCandle) == 0 {
+		g1.Go(func() error {
+			var err error
+			restCandle, err = exchange.FetchLatestCandles(ctx1, adapter, symbol, interval, vectorSize+1+99)
+			return err
+		})
+	}
 
 	g1.Go(func() error {
 		var err error
@@ -72,15 +63,11 @@ func NewLivePipeline(ctx context.Context, logger *slog.Logger, binanceClient *fu
 	})
 
 	if err := g1.Wait(); err != nil {
-		if dbIngest != nil {
-			dbIngest.Close()
-		}
 		hooks.OnPipelineError("init", err)
 		return fmt.Errorf("[LivePipeline] init: %w", err)
 	}
-	defer dbIngest.Close()
 
-	// --- 2) Embedding (sequential, depends on restCandle + dbIngest) ---
+	// --- 2) Embedding (sequential, depends on restCandle) ---
 	feature, label, wsRestCandle := NewEmbeddingPipeline(*logger, wsCandle, restCandle, vectorSize, symbol, interval)
 	if feature == nil {
 		hooks.OnPipelineError("embedding", fmt.Errorf("feature is nil"))
@@ -93,24 +80,16 @@ func NewLivePipeline(ctx context.Context, logger *slog.Logger, binanceClient *fu
 	g2, ctx2 := errgroup.WithContext(ctx)
 
 	g2.Go(func() error {
-		if err := dbIngest.UpsertFeature(ctx2, *feature); err != nil {
-			return fmt.Errorf("upsert feature: %w", err)
-		}
-		logger.Info("[LivePipeline] Ingested feature")
-		return nil
-	})
-
-	g2.Go(func() error {
-		if err := dbIngest.UpsertLabels(ctx2, symbol, interval, label); err != nil {
-			return fmt.Errorf("upsert labels: %w", err)
+		if err := dbIngest.UpsertFeatureWithLabels(ctx2, *feature, label); err != nil {
+			return fmt.Errorf("upsert feature and labels: %w", err)
 		}
-		logger.Info("[LivePipeline] Ingested label")
+		logger.Info("[LivePipeline] Ingested feature and label")
 		return nil
 	})
 
 	// TODO running only at 00 minute porint of time
 	g2.Go(func() error {
-		if err := RestIngestVectorFlow(logger, symbol, "1h", vectorSize); err != nil {
+		if err := RestIngestVectorFlow(ctx2, logger, adapter, dbIngest, symbol, "1h", vectorSize); err != nil {
 			return fmt.Errorf("ingest 1h timeframe: %w", err)
 		}
 		logger.Info("[LivePipeline] Ingested 1 hour timeframe")
@@ -174,7 +153,7 @@ func NewLivePipeline(ctx context.Context, logger *slog.Logger, binanceClient *fu
 
 	// --- 4) LLM ---
 	llmOutput, err := NewLLMPatternAgent(
-		ctx, binanceClient, *logger, cfg, cfg.Database, cfg.OpenRouter,
+		ctx, binanceClient, *logger, cfg, dbIngest, cfg.OpenRouter,
 		symbol, interval, wsRestCandle, feature.Embedding, cfg.LLM.TopN,
 	)
 	if err != nil {
@@ -199,7 +178,13 @@ func NewLivePipeline(ctx context.Context, logger *slog.Logger, binanceClient *fu
 	}
 
 	// fire-and-forget log insert — ไม่ block order path
+	// The pipeline still waits for it before returning, so the caller can
+	// close the shared pool once every pipeline has returned.
+	var logWG sync.WaitGroup
+	logWG.Add(1)
+	defer logWG.Wait()
 	go func() {
+		defer logWG.Done()
 		// ใช้ context ใหม่ เผื่อ parent ctx ถูก cancel หลัง return
 		logCtx, cancel := context.WithTimeout(context.Background(), 5*time.Second)
 		defer cancel()
@@ -228,8 +213,9 @@ func NewLivePipeline(ctx context.Context, logger *slog.Logger, binanceClient *fu
 }
 
 // SelectBestOpportunity runs the prefilter for each candidate symbol in parallel
-// and returns the one with the highest score above threshold. Returns ok=false when
-// no symbol meets the threshold or all REST fetches fail.
+// and returns the one with the highest score above threshold, together with the
+// REST candles it was scored on so the live pipeline does not fetch them again.
+// Returns ok=false when no symbol meets the threshold or all REST fetches fail.
 func SelectBestOpportunity(
 	ctx context.Context,
 	adapter exchange.KlineService,
@@ -238,10 +224,11 @@ func SelectBestOpportunity(
 	interval string,
 	vectorSize int,
 	threshold float64,
-) (symbol string, candle exchange.WsCandle, ok bool) {
+) (symbol string, candle exchange.WsCandle, rest []exchange.RestCandle, ok bool) {
 	type scored struct {
 		symbol string
 		candle exchange.WsCandle
+		rest   []exchange.RestCandle
 		score  float64
 	}
 
@@ -262,16 +249,9 @@ func SelectBestOpportunity(
 				slog.Warn("[SelectBest] fetch failed", "symbol", sym, "err", err)
 				return
 			}
-			wsRest := make([]exchange.WsRestCandle, len(rest))
-			for i, c := range rest {
-				wsRest[i] = exchange.WsRestCandle{
-					Time: c.Time, Open: c.Open, High: c.High,
-					Low: c.Low, Close: c.Close, Volume: c.Volume,
-				}
-			}
-			pf := prefilter.RunPrefilter(prefilter.Input{Candles: wsRest, Threshold: threshold})
+			pf := prefilter.RunPrefilter(prefilter.Input{Candles: exchange.ToWsRestCandles(rest), Threshold: threshold})
 			slog.Info("[SelectBest] scored", "symbol", sym, "score", fmt.Sprintf("%.1f", pf.Score))
-			ch <- scored{sym, wsCandle, pf.Score}
+			ch <- scored{sym, wsCandle, rest, pf.Score}
 		}(sym)
 	}
 	wg.Wait()
@@ -289,15 +269,8 @@ func SelectBestOpportunity(
 			"best_score", fmt.Sprintf("%.1f", best.score),
 			"threshold", threshold,
 		)
-		return "", exchange.WsCandle{}, false
+		return "", exchange.WsCandle{}, nil, false
 	}
 	slog.Info("[SelectBest] winner", "symbol", best.symbol, "score", fmt.Sprintf("%.1f", best.score))
-	return best.symbol, best.candle, true
-}
-
-// parseBinanceInterval converts Binance interval strings (e.g. "1d", "1w") that
-// time.ParseDuration cannot handle into valid Go duration strings.
-func parseBinanceInterval(s string) (time.Duration, error) {
-	r := strings.NewReplacer("1d", "24h", "2d", "48h", "3d", "72h", "1w", "168h")
-	return time.ParseDuration(r.Replace(s))
+	return best.symbol, best.candle, best.rest, true
 }
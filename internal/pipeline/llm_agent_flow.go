@@ -4,8 +4,11 @@ import (
 	"context"
 	"fmt"
 	"log/slog"
+	"os"
+	"sync"
 	"time"
 	"time-series-rag-agent/config"
+	"time-series-rag-agent/internal/embedding"
 	"time-series-rag-agent/internal/exchange"
 	"time-series-rag-agent/internal/llm"
 	"time-series-rag-agent/internal/plot"
@@ -13,6 +16,7 @@ import (
 	"time-series-rag-agent/internal/trade"
 
 	"github.com/adshao/go-binance/v2/futures"
+	"golang.org/x/sync/errgroup"
 )
 
 const (
@@ -22,56 +26,102 @@ const (
 	TopN1H                 = 10
 )
 
-func NewLLMPatternAgent(ctx context.Context, futureClient *futures.Client, logger slog.Logger, appConfig *config.AppConfig, dbConfig config.DatabaseConfig, openRouterConfig config.OpenRouterConfig, symbol string, interval string, candel []exchange.WsRestCandle, feature []float64, topN int) (llm.TradeSignal, error) {
-	connString := fmt.Sprintf("postgres://%s:%s@%s:%d/%s",
-		dbConfig.DBUser,
-		dbConfig.DBPassword,
-		dbConfig.DBHost,
-		dbConfig.DBPort,
-		dbConfig.DBName,
-	)
-	db, err := postgresql.NewPostgresDB(ctx, connString, logger)
-	if err != nil {
-		logger.Error("[LLMPatternPipeline] Cannot establish connection for candle ingestion.")
-		return llm.TradeSignal{}, err
-	}
-	defer db.Close()
-
-	patterns, err := db.QueryTopN(ctx, symbol, interval, feature, topN)
-	if err != nil {
-		logger.Error("[LLMPatternPipeline] Error from query Top n")
-		return llm.TradeSignal{}, err
-	}
+// The LLM service is shared by every bar and symbol in the process, so calls
+// reuse one warm HTTP transport and the daily token budget actually accumulates.
+var (
+	sharedLLMOnce sync.Once
+	sharedLLM     *llm.LLMService
+)
 
-	patterns1h, err := db.QueryTopN(ctx, symbol, "1h", feature, TopN1H)
-	if err != nil {
-		logger.Error("[LLMPatternPipeline] Error from query Top n")
-		return llm.TradeSignal{}, err
-	}
+func sharedLLMService(apiKey string, maxDailyTokens int) *llm.LLMService {
+	sharedLLMOnce.Do(func() {
+		sharedLLM = llm.NewLLMService(apiKey, maxDailyTokens)
+	})
+	return sharedLLM
+}
 
-	plot.GenerateCandleChart(candel, CANDLE_FILE_NAME, LATEST_CANDLE_PLOT)
-	logger.Info("[LLMPatternPipeline] Finished plot")
+func NewLLMPatternAgent(ctx context.Context, futureClient *futures.Client, logger slog.Logger, appConfig *config.AppConfig, db *postgresql.PatternStore, openRouterConfig config.OpenRouterConfig, symbol string, interval string, candel []exchange.WsRestCandle, feature []float64, topN int) (llm.TradeSignal, error) {
+	// --- Independent I/O (pgvector, chart render, Binance REST) in parallel ---
+	var (
+		patterns     []embedding.PatternLabel
+		patterns1h   []embedding.PatternLabel
+		regime       map[string]exchange.IntervalRegime
+		dailyPnL     float64
+		roi          float64
+		tradeHistory []trade.PositionHistory
+		chartPNG     []byte
+	)
 
-	llmService := llm.NewLLMService(openRouterConfig.ApiKey, appConfig.LLM.MaxDailyTokens)
-	regime, err := exchange.FetchLatestRegimes(logger, futureClient, appConfig, symbol, []string{"4h", "1d"})
-	if err != nil {
-		logger.Error("[LLMPatternPipeline] Regime fetching")
+	g, gctx := errgroup.WithContext(ctx)
+
+	g.Go(func() error {
+		var err error
+		patterns, err = db.QueryTopN(gctx, symbol, interval, feature, topN, false)
+		if err != nil {
+			logger.Error("[LLMPatternPipeline] Error from query Top n")
+		}
+		return err
+	})
+
+	g.Go(func() error {
+		var err error
+		patterns1h, err = db.QueryTopN(gctx, symbol, "1h", feature, TopN1H, false)
+		if err != nil {
+			logger.Error("[LLMPatternPipeline] Error from query Top n")
+		}
+		return err
+	})
+
+	g.Go(func() error {
+		var err error
+		chartPNG, err = plot.RenderCandleChart(candel, LATEST_CANDLE_PLOT)
+		if err != nil {
+			logger.Error("[LLMPatternPipeline] Error at plot")
+			return err
+		}
+		// file copy is still needed by the Discord order hook
+		if err := os.WriteFile(CANDLE_FILE_NAME, chartPNG, 0o644); err != nil {
+			logger.Error("[LLMPatternPipeline] Error at saving plot")
+			return err
+		}
+		logger.Info("[LLMPatternPipeline] Finished plot")
+		return nil
+	})
+
+	g.Go(func() error {
+		var err error
+		regime, err = exchange.FetchLatestRegimes(logger, futureClient, appConfig, symbol, []string{"4h", "1d"})
+		if err != nil {
+			logger.Error("[LLMPatternPipeline] Regime fetching")
+		}
+		return err
+	})
+
+	g.Go(func() error {
+		var err error
+		dailyPnL, roi, err = trade.CalculateDailyROI(futureClient)
+		if err != nil {
+			logger.Error("[LLMPatternPipeline] Error at PnL calculation")
+		}
+		return err
+	})
+
+	g.Go(func() error {
+		var err error
+		tradeHistory, err = trade.GetPositionHistory(futureClient, symbol, TRADING_LOOK_BACK_DAYS)
+		if err != nil {
+			logger.Error("[LLMPatternPipeline] Error at position history")
+		}
+		return err
+	})
+
+	if err := g.Wait(); err != nil {
 		return llm.TradeSignal{}, err
 	}
 
+	llmService := sharedLLMService(openRouterConfig.ApiKey, appConfig.LLM.MaxDailyTokens)
 	currentTimestamp := time.Now().UTC().Format("2006-01-02 15:04:05")
 
-	dailyPnL, roi, err := trade.CalculateDailyROI(futureClient)
-	if err != nil {
-		logger.Error("[LLMPatternPipeline] Error at PnL calculation")
-		return llm.TradeSignal{}, err
-	}
-
-	tradeHistory, err := trade.GetPositionHistory(futureClient, symbol, TRADING_LOOK_BACK_DAYS)
-	if err != nil {
-		logger.Error("[LLMPatternPipeline] Error at position history")
-		return llm.TradeSignal{}, err
-	}
 	promptPositions := tradeHistory
 	if len(promptPositions) > appConfig.LLM.LimitTradeHistory {
 		promptPositions = promptPositions[:appConfig.LLM.LimitTradeHistory]
@@ -79,7 +129,7 @@ func NewLLMPatternAgent(ctx context.Context, futureClient *futures.Client, logge
 
 	logger.Info(fmt.Sprintf("Current ROI=%f, PnL=%f", roi, dailyPnL))
 
-	systemMessage, userContent, b64Candle, err := llmService.GenerateTradingPrompt(currentTimestamp, patterns, patterns1h, CANDLE_FILE_NAME, promptPositions, regime, dailyPnL, symbol)
+	systemMessage, userContent, b64Candle, err := llmService.GenerateTradingPrompt(currentTimestamp, patterns, patterns1h, chartPNG, promptPositions, regime, dailyPnL, symbol)
 	if err != nil {
 		logger.Error(fmt.Sprintf("Prompt Error: %v", err))
 		return llm.TradeSignal{}, err
@@ -1,6 +1,7 @@
 package plot
 
 import (
+	"bytes"
 	"fmt"
 	"image/color"
 	"math"
@@ -178,7 +179,18 @@ func calculateSMA(data []float64, period int) []float64 {
 // --- 3. Main Chart Generation Function ---
 // ... (Imports and Ticker struct remain the same) ...
 
+// GenerateCandleChart renders the chart and writes the PNG to filename.
 func GenerateCandleChart(candles []exchange.WsRestCandle, filename string, lastNPlot ...int) error {
+	png, err := RenderCandleChart(candles, lastNPlot...)
+	if err != nil {
+		return err
+	}
+	return os.WriteFile(filename, png, 0o644)
+}
+
+// RenderCandleChart renders the chart and returns the encoded PNG bytes, so callers
+// that need the image in memory (LLM prompt) do not have to read the file back.
+func RenderCandleChart(candles []exchange.WsRestCandle, lastNPlot ...int) ([]byte, error) {
 	p := plot.New()
 	volumePlot := plot.New()
 
@@ -307,14 +319,9 @@ func GenerateCandleChart(candles []exchange.WsRestCandle, filename string, lastN
 	p.Draw(priceCanvas)
 	volumePlot.Draw(volumeCanvas)
 
-	w, err := os.Create(filename)
-	if err != nil {
-		return err
+	var buf bytes.Buffer
+	if err := writePNG(&buf, img); err != nil {
+		return nil, err
 	}
-	defer w.Close()
-
-	png := vgimg.PngCanvas{Canvas: img}
-	_, err = png.WriteTo(w)
-
-	return err
+	return buf.Bytes(), nil
 }
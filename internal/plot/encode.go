@@ -0,0 +1,36 @@
+package plot
+
+import (
+	"image/png"
+	"io"
+	"sync"
+
+	"gonum.org/v1/plot/vg/vgimg"
+)
+
+// pngBufferPool lets the PNG encoder reuse its zlib/filter buffers across
+// renders instead of allocating them for every chart.
+type pngBufferPool struct {
+	pool sync.Pool
+}
+
+func (p *pngBufferPool) Get() *png.EncoderBuffer {
+	b, _ := p.pool.Get().(*png.EncoderBuffer)
+	return b
+}
+
+func (p *pngBufferPool) Put(b *png.EncoderBuffer) {
+	p.pool.Put(b)
+}
+
+// Charts are mostly flat fills at 72 DPI, so the strongest zlib level shrinks
+// them noticeably for little CPU; the bytes are base64'd into every LLM request.
+var pngEncoder = &png.Encoder{
+	CompressionLevel: png.BestCompression,
+	BufferPool:       &pngBufferPool{},
+}
+
+// writePNG encodes the rendered canvas with the shared encoder.
+func writePNG(w io.Writer, c *vgimg.Canvas) error {
+	return pngEncoder.Encode(w, c.Image())
+}
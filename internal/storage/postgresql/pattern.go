@@ -3,10 +3,13 @@ package postgresql
 import (
 	"context"
 	"fmt"
+	"strconv"
 	"time"
 
+	"github.com/jackc/pgx/v5"
 	"github.com/jackc/pgx/v5/pgxpool"
 	"github.com/pgvector/pgvector-go"
+	pgxvec "github.com/pgvector/pgvector-go/pgx"
 
 	"time-series-rag-agent/internal/embedding"
 
@@ -33,43 +36,79 @@ type PatternStore struct {
 	logger slog.Logger
 }
 
+// poolMinConns matches the two QueryTopN calls LLMPatternPipeline runs in parallel.
+const poolMinConns = 2
+
 func NewPostgresDB(ctx context.Context, connString string, logger slog.Logger) (*PatternStore, error) {
-	pool, err := pgxpool.New(ctx, connString)
+	cfg, err := pgxpool.ParseConfig(connString)
+	if err != nil {
+		return nil, err
+	}
+	// Register vector/halfvec (and vector[] for bulk writes) on every
+	// connection so embeddings travel in pgvector's binary format instead of
+	// being parsed from "[...]" text.
+	cfg.AfterConnect = func(ctx context.Context, conn *pgx.Conn) error {
+		if err := pgxvec.RegisterTypes(ctx, conn); err != nil {
+			return err
+		}
+		vectorArray, err := conn.LoadType(ctx, "_vector")
+		if err != nil {
+			return err
+		}
+		conn.TypeMap().RegisterType(vectorArray)
+		return nil
+	}
+
+	// Keep warm connections for the live loop's concurrent top-N lookups so a
+	// bar after an idle gap does not pay connect + AfterConnect type loading.
+	// A pool_min_conns in the connection string still takes precedence.
+	if cfg.MinConns == 0 {
+		cfg.MinConns = poolMinConns
+	}
+
+	pool, err := pgxpool.NewWithConfig(ctx, cfg)
 	if err != nil {
 		return nil, err
 	}
 	return &PatternStore{db: pool, logger: logger}, nil
 }
 
-// UpsertFeature inserts or updates embedding + close_price for a given candle time.
-func (s *PatternStore) UpsertFeature(ctx context.Context, f embedding.PatternFeature) error {
-	vec := make([]float32, len(f.Embedding))
-	for i, v := range f.Embedding {
-		vec[i] = float32(v)
-	}
+// labelColumnSQL upserts one label column from parallel time/value arrays;
+// symbol ($2) and interval ($3) are scalars shared by every row.
+// Built once per allowed column into labelColumnSQLs.
+func labelColumnSQL(col string) string {
+	return fmt.Sprintf(`
+		INSERT INTO market_pattern_go (time, symbol, interval, %s)
+		SELECT u.time, $2, $3, u.value
+		FROM UNNEST($1::bigint[], $4::float8[]) AS u(time, value)
+		ON CONFLICT (time, symbol, interval) DO UPDATE SET
+			%s = EXCLUDED.%s
+	`, col, col, col)
+}
 
-	_, err := s.db.Exec(ctx, upsertPatternSQL,
+// labelColumnSQLs holds the label upsert for every allowed column, so the live
+// path looks its statement up instead of formatting it per bar. Its keys are
+// also the whitelist checked by validateLabelColumn.
+var labelColumnSQLs = map[string]string{
+	"next_return":  labelColumnSQL("next_return"),
+	"next_slope_3": labelColumnSQL("next_slope_3"),
+	"next_slope_5": labelColumnSQL("next_slope_5"),
+}
+
+// UpsertFeatureWithLabels writes the live bar's feature and its label updates in a
+// single round trip. pgx runs the queued statements in one implicit transaction,
+// so the feature upsert runs before the label updates.
+func (s *PatternStore) UpsertFeatureWithLabels(ctx context.Context, f embedding.PatternFeature, labels []embedding.LabelUpdate) error {
+	batch := &pgx.Batch{}
+	batch.Queue(upsertPatternSQL,
 		f.Time.Unix(),
 		f.Symbol,
 		f.Interval,
-		pgvector.NewVector(vec),
+		toPgVector(f.Embedding),
 		f.ClosePrice,
 		nil, nil, nil,
 	)
-	if err != nil {
-		return fmt.Errorf("UpsertFeature: %w", err)
-	}
-	return nil
-}
 
-// UpsertLabels updates label columns for past candles.
-// Each LabelUpdate targets a specific (TargetTime, symbol, interval) row.
-func (s *PatternStore) UpsertLabels(ctx context.Context, symbol, interval string, labels []embedding.LabelUpdate) error {
-	if len(labels) == 0 {
-		return nil
-	}
-
-	// group by column เพราะแต่ละ column ต้องใช้ SQL ต่างกัน
 	grouped := map[string][]embedding.LabelUpdate{}
 	for _, l := range labels {
 		if _, err := validateLabelColumn(l.Column); err != nil {
@@ -77,121 +116,244 @@ func (s *PatternStore) UpsertLabels(ctx context.Context, symbol, interval string
 		}
 		grouped[l.Column] = append(grouped[l.Column], l)
 	}
-
 	for col, group := range grouped {
-		if err := s.bulkUpsertLabelColumn(ctx, symbol, interval, col, group); err != nil {
-			return err
+		times := make([]int64, len(group))
+		values := make([]float64, len(group))
+		for j, l := range group {
+			times[j] = l.TargetTime
+			values[j] = l.Value
 		}
+		batch.Queue(labelColumnSQLs[col], times, f.Symbol, f.Interval, values)
+	}
+
+	br := s.db.SendBatch(ctx, batch)
+	for i := 0; i < batch.Len(); i++ {
+		if _, err := br.Exec(); err != nil {
+			br.Close()
+			return fmt.Errorf("UpsertFeatureWithLabels statement %d: %w", i, err)
+		}
+	}
+	if err := br.Close(); err != nil {
+		return fmt.Errorf("UpsertFeatureWithLabels: %w", err)
 	}
 	return nil
 }
 
-func (s *PatternStore) bulkUpsertLabelColumn(ctx context.Context, symbol, interval, col string, labels []embedding.LabelUpdate) error {
-	const batchSize = 1000
-	const maxRetries = 3
+const (
+	hnswMinEfSearch = 40
+	hnswMaxEfSearch = 1000 // pgvector upper bound
+	rerankFactor    = 4    // fp16 candidates fetched per requested row before fp32 re-rank
+)
 
-	sql := fmt.Sprintf(`
-		INSERT INTO market_pattern_go (time, symbol, interval, %s)
-		SELECT
-			UNNEST($1::bigint[]),
-			UNNEST($2::text[]),
-			UNNEST($3::text[]),
-			UNNEST($4::float8[])
-		ON CONFLICT (time, symbol, interval) DO UPDATE SET
-			%s = EXCLUDED.%s
-	`, col, col, col)
+// hnswBuildParams picks the HNSW graph degree and build list size for a table of
+// roughly rows vectors; larger graphs need more links to keep recall. Tiers past
+// 100k rows also raise maintenance_work_mem so the build stays in memory.
+func hnswBuildParams(rows int64) (m, efConstruction int, workMem string) {
+	switch {
+	case rows < 100_000:
+		return 16, 64, ""
+	case rows < 1_000_000:
+		return 24, 100, "1GB"
+	default:
+		return 32, 128, "2GB"
+	}
+}
 
-	for i := 0; i < len(labels); i += batchSize {
-		end := i + batchSize
-		if end > len(labels) {
-			end = len(labels)
+// EnsureVectorIndex creates the HNSW inner-product index used by QueryTopN if it does not exist.
+// The index is built on embedding::halfvec(dim), so the graph scan reads fp16 pages
+// (half the bytes of the fp32 column); QueryTopN re-ranks the candidates in fp32.
+// Build it after bulk loads; inserting into an existing HNSW index is slower than one build.
+// Build parameters come from the planner's row estimate (see hnswBuildParams); an
+// existing index is kept as is, drop it to rebuild with a new tier.
+//
+// Every symbols x intervals pair also gets a partial index of its own, so a query
+// for that pair walks a graph of only its rows instead of filtering the global
+// graph after the scan. The global index stays as the fallback for other pairs.
+func (s *PatternStore) EnsureVectorIndex(ctx context.Context, dim int, symbols, intervals []string) error {
+	for _, v := range append(append([]string{}, symbols...), intervals...) {
+		if !isPlainIdent(v) {
+			return fmt.Errorf("EnsureVectorIndex: invalid symbol/interval %q", v)
 		}
-		batch := labels[i:end]
+	}
 
-		times := make([]int64, len(batch))
-		values := make([]float64, len(batch))
-		symbols := make([]string, len(batch))
-		intervals := make([]string, len(batch))
-		for j, l := range batch {
-			times[j] = l.TargetTime
-			values[j] = l.Value
-			symbols[j] = symbol
-			intervals[j] = interval
+	// Refresh the estimate first: right after a bulk load autovacuum may not
+	// have analyzed the table yet (reltuples is -1 before the first ANALYZE).
+	if _, err := s.db.Exec(ctx, "ANALYZE market_pattern_go"); err != nil {
+		return fmt.Errorf("EnsureVectorIndex analyze: %w", err)
+	}
+	var rows float64
+	if err := s.db.QueryRow(ctx,
+		"SELECT reltuples FROM pg_class WHERE oid = 'market_pattern_go'::regclass",
+	).Scan(&rows); err != nil {
+		return fmt.Errorf("EnsureVectorIndex row estimate: %w", err)
+	}
+	m, efConstruction, workMem := hnswBuildParams(int64(rows))
+
+	tx, err := s.db.Begin(ctx)
+	if err != nil {
+		return fmt.Errorf("EnsureVectorIndex begin: %w", err)
+	}
+	defer tx.Rollback(ctx)
+
+	if workMem != "" {
+		if _, err := tx.Exec(ctx, "SELECT set_config('maintenance_work_mem', $1, true)", workMem); err != nil {
+			return fmt.Errorf("EnsureVectorIndex maintenance_work_mem: %w", err)
 		}
+	}
 
-		var lastErr error
-		for attempt := 0; attempt <= maxRetries; attempt++ {
-			if attempt > 0 {
-				wait := time.Duration(attempt*attempt) * time.Second
-				s.logger.Warn(fmt.Sprintf("[UpsertLabels] retrying %s batch %d-%d (attempt %d/%d) after %s: %v",
-					col, i, end, attempt+1, maxRetries, wait, lastErr))
-				time.Sleep(wait)
-			}
-			batchCtx, cancel := context.WithTimeout(ctx, 60*time.Second)
-			_, lastErr = s.db.Exec(batchCtx, sql, times, symbols, intervals, values)
-			cancel()
-			if lastErr == nil {
-				break
+	sql := fmt.Sprintf(`
+		CREATE INDEX IF NOT EXISTS market_pattern_go_embedding_hv%d_ip_hnsw_idx
+		ON market_pattern_go USING hnsw ((embedding::halfvec(%d)) halfvec_ip_ops)
+		WITH (m = %d, ef_construction = %d)
+	`, dim, dim, m, efConstruction)
+
+	if _, err := tx.Exec(ctx, sql); err != nil {
+		return fmt.Errorf("EnsureVectorIndex: %w", err)
+	}
+
+	// Values are checked by isPlainIdent above; DDL cannot take bind parameters.
+	// The index name is quoted so it keeps its case: unquoted, Postgres would
+	// fold 1M (month) onto 1m (minute) and IF NOT EXISTS would skip one of them.
+	for _, symbol := range symbols {
+		for _, interval := range intervals {
+			name := pgx.Identifier{fmt.Sprintf("market_pattern_go_hv%d_ip_%s_%s_idx", dim, symbol, interval)}.Sanitize()
+			sql := fmt.Sprintf(`
+				CREATE INDEX IF NOT EXISTS %s
+				ON market_pattern_go USING hnsw ((embedding::halfvec(%d)) halfvec_ip_ops)
+				WITH (m = %d, ef_construction = %d)
+				WHERE symbol = '%s' AND interval = '%s'
+			`, name, dim, m, efConstruction, symbol, interval)
+			if _, err := tx.Exec(ctx, sql); err != nil {
+				return fmt.Errorf("EnsureVectorIndex %s %s: %w", symbol, interval, err)
 			}
 		}
-		if lastErr != nil {
-			return fmt.Errorf("bulkUpsertLabelColumn [%s batch %d-%d]: %w", col, i, end, lastErr)
-		}
 	}
+
+	if err := tx.Commit(ctx); err != nil {
+		return fmt.Errorf("EnsureVectorIndex commit: %w", err)
+	}
+	s.logger.Info(fmt.Sprintf("[EnsureVectorIndex] rows~%.0f m=%d ef_construction=%d", rows, m, efConstruction))
 	return nil
 }
 
-// QueryTopN returns the N most similar rows to the given embedding using cosine distance.
-func (s *PatternStore) QueryTopN(ctx context.Context, symbol, interval string, queryEmbedding []float64, topN int) ([]embedding.PatternLabel, error) {
-	sql := `
+// isPlainIdent reports whether v is non-empty ASCII letters/digits only, which is
+// safe to put into an index name and a quoted predicate literal.
+func isPlainIdent(v string) bool {
+	if v == "" {
+		return false
+	}
+	for _, c := range v {
+		if !('a' <= c && c <= 'z' || 'A' <= c && c <= 'Z' || '0' <= c && c <= '9') {
+			return false
+		}
+	}
+	return true
+}
+
+// hnswEfSearch sizes the HNSW candidate list for a top-N query. The global index
+// spans every symbol/interval, so candidates are filtered after the graph scan and
+// ef_search has to be well above topN to still return N rows (per-pair partial
+// indexes need less, but the same value keeps the fallback path correct).
+func hnswEfSearch(topN int) int {
+	ef := topN * 20
+	if ef < hnswMinEfSearch {
+		ef = hnswMinEfSearch
+	}
+	if ef > hnswMaxEfSearch {
+		ef = hnswMaxEfSearch
+	}
+	return ef
+}
+
+// QueryTopN returns the N most similar rows to the given embedding, ranked by inner
+// product and reported as cosine distance.
+// Stored embeddings are only sent back when withEmbedding is set (e.g. to draw the
+// match shapes); symbol and interval are the filter values, so they are not read back.
+//
+// This assumes every embedding is a z-score with population std, as
+// FeatureCalculator builds them: a non-flat vector then has squared norm dim, so
+// cosine distance is 1 - a·b/dim and the query gets it from the cheaper inner
+// product (pgvector's <#> returns -a·b) without normalizing per row. A flat window
+// embeds as the zero vector, which has no cosine: a flat stored row is reported at
+// distance 1 (as if orthogonal) instead of being skipped, and a flat query embedding
+// puts every row at distance 1.
+func (s *PatternStore) QueryTopN(ctx context.Context, symbol, interval string, queryEmbedding []float64, topN int, withEmbedding bool) ([]embedding.PatternLabel, error) {
+	// Inner query walks the halfvec HNSW index (see EnsureVectorIndex);
+	// outer query re-ranks that short list with the exact fp32 distance.
+	dim := len(queryEmbedding)
+	candidates := topN * rerankFactor
+	embeddingCol := ""
+	if withEmbedding {
+		embeddingCol = "embedding,"
+	}
+	sql := fmt.Sprintf(`
 		SELECT
-			time, symbol, interval,
-			close_price, next_return, next_slope_3, next_slope_5,
-			embedding,
-			embedding <=> $1 AS distance
-		FROM market_pattern_go
-		WHERE symbol   = $2
-			AND interval = $3
-			AND embedding IS NOT NULL
-		ORDER BY embedding <=> $1
+			time,
+			close_price,
+			COALESCE(next_return,  0),
+			COALESCE(next_slope_3, 0),
+			COALESCE(next_slope_5, 0),
+			%s
+			1 + (embedding <#> $1::vector) / %d AS distance
+		FROM (
+			SELECT time,
+				close_price, next_return, next_slope_3, next_slope_5,
+				embedding
+			FROM market_pattern_go
+			WHERE symbol   = $2
+				AND interval = $3
+				AND embedding IS NOT NULL
+			ORDER BY embedding::halfvec(%d) <#> $1::vector::halfvec(%d)
+			LIMIT $5
+		) candidates
+		ORDER BY distance
 		LIMIT $4
-	`
+	`, embeddingCol, dim, dim, dim)
 
 	s.logger.Info(fmt.Sprintf("Querying with param: symbol=%s, interval=%s, topN=%d", symbol, interval, topN))
-	rows, err := s.db.Query(ctx, sql, toVectorLiteral(queryEmbedding), symbol, interval, topN)
 
+	// ef_search is scoped to the transaction (SET LOCAL semantics) so the HNSW
+	// scan keeps enough candidates after the symbol/interval filter. Custom
+	// plans are forced the same way: a cached generic plan cannot prove the
+	// per-pair partial index predicate and would fall back to the global index.
+	// Both statements go in one batch, which pgx runs as a single implicit
+	// transaction: one round trip instead of begin/set/query/rollback.
+	batch := &pgx.Batch{}
+	batch.Queue(`SELECT set_config('hnsw.ef_search', $1, true),
+		set_config('plan_cache_mode', 'force_custom_plan', true)`, strconv.Itoa(hnswEfSearch(candidates)))
+	batch.Queue(sql, toPgVector(queryEmbedding), symbol, interval, topN, candidates)
+
+	br := s.db.SendBatch(ctx, batch)
+	defer br.Close()
+
+	if _, err := br.Exec(); err != nil {
+		return nil, fmt.Errorf("QueryTopN ef_search: %w", err)
+	}
+
+	rows, err := br.Query()
 	if err != nil {
 		return nil, fmt.Errorf("QueryTopN: %w", err)
 	}
 	defer rows.Close()
 
-	var results []embedding.PatternLabel
+	// Missing labels are already 0 from COALESCE, so every column scans
+	// straight into the result row without per-row *float64 temporaries.
+	results := make([]embedding.PatternLabel, 0, topN)
+	var (
+		r        embedding.PatternLabel
+		unixTime int64
+	)
+	dest := []any{&unixTime, &r.ClosePrice, &r.NextReturn, &r.NextSlope3, &r.NextSlope5, &r.Distance}
+	if withEmbedding {
+		dest = []any{&unixTime, &r.ClosePrice, &r.NextReturn, &r.NextSlope3, &r.NextSlope5, &r.Embedding, &r.Distance}
+	}
 	for rows.Next() {
-		var (
-			unixTime   int64
-			sym        string
-			intv       string
-			closePrice float64
-			nextReturn *float64
-			nextSlope3 *float64
-			nextSlope5 *float64
-			Embedding  pgvector.Vector
-			distance   float64
-		)
-		if err := rows.Scan(&unixTime, &sym, &intv, &closePrice, &nextReturn, &nextSlope3, &nextSlope5, &Embedding, &distance); err != nil {
+		r = embedding.PatternLabel{Symbol: symbol, Interval: interval}
+		if err := rows.Scan(dest...); err != nil {
 			return nil, fmt.Errorf("QueryTopN scan: %w", err)
 		}
-		results = append(results, embedding.PatternLabel{
-			Time:       time.Unix(unixTime, 0),
-			Symbol:     sym,
-			Interval:   intv,
-			ClosePrice: closePrice,
-			NextReturn: derefOr(nextReturn, 0),
-			NextSlope3: derefOr(nextSlope3, 0),
-			NextSlope5: derefOr(nextSlope5, 0),
-			Embedding:  Embedding,
-			Distance:   distance,
-		})
+		r.Time = time.Unix(unixTime, 0)
+		results = append(results, r)
 	}
 	if err := rows.Err(); err != nil {
 		return nil, fmt.Errorf("QueryTopN rows: %w", err)
@@ -202,97 +364,151 @@ func (s *PatternStore) QueryTopN(ctx context.Context, symbol, interval string, q
 
 // --- helpers ---
 
-// toVectorLiteral converts []float64 to pgvector literal e.g. "[0.1,0.2,0.3]"
-func toVectorLiteral(v []float64) string {
-	if len(v) == 0 {
-		return "[]"
-	}
-	s := "["
+// toPgVector narrows an embedding to the float32 pgvector value bound as a
+// query parameter (sent in binary once the types are registered).
+func toPgVector(v []float64) pgvector.Vector {
+	vec := make([]float32, len(v))
 	for i, f := range v {
-		if i > 0 {
-			s += ","
+		vec[i] = float32(f)
+	}
+	return pgvector.NewVector(vec)
+}
+
+// toPgVectors narrows rows into pgvector values that share one float32
+// backing array; buf is reused when large enough. The returned values alias
+// buf, so they must be sent before buf is reused.
+func toPgVectors(rows [][]float64, vecs []pgvector.Vector, buf []float32) ([]pgvector.Vector, []float32) {
+	total := 0
+	for _, r := range rows {
+		total += len(r)
+	}
+	if cap(buf) < total {
+		buf = make([]float32, total)
+	}
+	buf = buf[:total]
+
+	vecs = vecs[:0]
+	off := 0
+	for _, r := range rows {
+		row := buf[off : off+len(r) : off+len(r)]
+		for j, f := range r {
+			row[j] = float32(f)
 		}
-		s += fmt.Sprintf("%.10f", f)
+		vecs = append(vecs, pgvector.NewVector(row))
+		off += len(r)
 	}
-	s += "]"
-	return s
+	return vecs, buf
 }
 
 // validateLabelColumn whitelists allowed column names to prevent SQL injection.
 func validateLabelColumn(col string) (string, error) {
-	allowed := map[string]bool{
-		"next_return":  true,
-		"next_slope_3": true,
-		"next_slope_5": true,
-	}
-	if !allowed[col] {
+	if _, ok := labelColumnSQLs[col]; !ok {
 		return "", fmt.Errorf("invalid label column: %q", col)
 	}
 	return col, nil
 }
 
-func derefOr(v *float64, fallback float64) float64 {
-	if v == nil {
-		return fallback
-	}
-	return *v
-}
+// upsertPatternBatchSQL writes one column-oriented batch. symbol/interval are
+// scalar parameters; labels arrive as float8 with NaN meaning "not known yet"
+// and are turned into NULL so COALESCE keeps any existing value.
+const upsertPatternBatchSQL = `
+INSERT INTO market_pattern_go (
+    time, symbol, interval,
+    embedding,
+    close_price, next_return, next_slope_3, next_slope_5
+)
+SELECT
+    u.time, $2, $3,
+    u.embedding,
+    u.close_price,
+    NULLIF(u.next_return,  'NaN'::float8),
+    NULLIF(u.next_slope_3, 'NaN'::float8),
+    NULLIF(u.next_slope_5, 'NaN'::float8)
+FROM UNNEST($1::bigint[], $4::vector[], $5::float8[], $6::float8[], $7::float8[], $8::float8[])
+    AS u(time, embedding, close_price, next_return, next_slope_3, next_slope_5)
+ON CONFLICT (time, symbol, interval) DO UPDATE SET
+    embedding    = EXCLUDED.embedding,
+    close_price  = EXCLUDED.close_price,
+    next_return  = COALESCE(EXCLUDED.next_return,  market_pattern_go.next_return),
+    next_slope_3 = COALESCE(EXCLUDED.next_slope_3, market_pattern_go.next_slope_3),
+    next_slope_5 = COALESCE(EXCLUDED.next_slope_5, market_pattern_go.next_slope_5)
+`
 
-func (s *PatternStore) BulkUpsertFeature(ctx context.Context, features []embedding.PatternFeature) error {
-	if len(features) == 0 {
+// BulkUpsertPatternBatch writes features and labels together in one transaction.
+// The batch is already column-oriented, so each 1000-row chunk is passed as
+// sub-slices of its columns; only the embeddings are converted per chunk, into
+// float32 vectors over one reused backing array sent as a binary vector[].
+func (s *PatternStore) BulkUpsertPatternBatch(ctx context.Context, b *embedding.PatternBatch) error {
+	n := b.Len()
+	if n == 0 {
 		return nil
 	}
 
-	const batchSize = 1000
+	tx, err := s.db.Begin(ctx)
+	if err != nil {
+		return fmt.Errorf("BulkUpsertPatternBatch begin: %w", err)
+	}
+	defer tx.Rollback(ctx)
 
-	for i := 0; i < len(features); i += batchSize {
-		s.logger.Info(fmt.Sprintln("Upserting feature: ", i))
+	const batchSize = 1000
+	embeddings := make([]pgvector.Vector, 0, batchSize)
+	var buf []float32
+	for i := 0; i < n; i += batchSize {
 		end := i + batchSize
-		if end > len(features) {
-			end = len(features)
+		if end > n {
+			end = n
 		}
-		batch := features[i:end]
 
-		if err := s.upsertFeatureBatch(ctx, batch); err != nil {
-			return fmt.Errorf("BulkUpsertFeature batch %d-%d: %w", i, end, err)
+		embeddings, buf = toPgVectors(b.Embedding[i:end], embeddings, buf)
+
+		if _, err := tx.Exec(ctx, upsertPatternBatchSQL,
+			b.Time[i:end], b.Symbol, b.Interval, embeddings,
+			b.ClosePrice[i:end], b.NextReturn[i:end], b.NextSlope3[i:end], b.NextSlope5[i:end],
+		); err != nil {
+			return fmt.Errorf("BulkUpsertPatternBatch batch %d-%d: %w", i, end, err)
 		}
+		s.logger.Info(fmt.Sprintf("[BulkUpsertPatternBatch] upserted rows %d-%d/%d", i, end, n))
+	}
+
+	if err := tx.Commit(ctx); err != nil {
+		return fmt.Errorf("BulkUpsertPatternBatch commit: %w", err)
 	}
 	return nil
 }
 
-func (s *PatternStore) upsertFeatureBatch(ctx context.Context, features []embedding.PatternFeature) error {
-	times := make([]int64, len(features))
-	symbols := make([]string, len(features))
-	intervals := make([]string, len(features))
-	embeddings := make([]string, len(features))
-	closePrices := make([]float64, len(features))
-
-	for i, f := range features {
-		times[i] = f.Time.Unix()
-		symbols[i] = f.Symbol
-		intervals[i] = f.Interval
-		embeddings[i] = toVectorLiteral(f.Embedding)
-		closePrices[i] = f.ClosePrice
-	}
-
-	_, err := s.db.Exec(ctx, `
-        INSERT INTO market_pattern_go (time, symbol, interval, embedding, close_price)
-        SELECT
-            UNNEST($1::bigint[]),
-            UNNEST($2::text[]),
-            UNNEST($3::text[]),
-            UNNEST($4::text[])::vector,
-            UNNEST($5::float8[])
-        ON CONFLICT (time, symbol, interval) DO UPDATE SET
-            embedding   = EXCLUDED.embedding,
-            close_price = EXCLUDED.close_price
-    `, times, symbols, intervals, embeddings, closePrices)
-	if err != nil {
-		return err
+// EnsureLookupIndex creates the (symbol, interval, time DESC) B-tree behind
+// LatestTime. The primary key leads with time, so without it max(time) for one
+// pair walks every other pair's newer rows first.
+func (s *PatternStore) EnsureLookupIndex(ctx context.Context) error {
+	if _, err := s.db.Exec(ctx, `
+		CREATE INDEX IF NOT EXISTS market_pattern_go_symbol_interval_time_idx
+		ON market_pattern_go (symbol, interval, time DESC)
+	`); err != nil {
+		return fmt.Errorf("EnsureLookupIndex: %w", err)
 	}
 	return nil
 }
 
+// LatestTime returns the newest candle time (unix seconds) that already has an
+// embedding for symbol/interval. ok is false when nothing has been ingested yet.
+func (s *PatternStore) LatestTime(ctx context.Context, symbol, interval string) (int64, bool, error) {
+	var latest *int64
+	err := s.db.QueryRow(ctx, `
+		SELECT max(time)
+		FROM market_pattern_go
+		WHERE symbol   = $1
+			AND interval = $2
+			AND embedding IS NOT NULL
+	`, symbol, interval).Scan(&latest)
+	if err != nil {
+		return 0, false, fmt.Errorf("LatestTime: %w", err)
+	}
+	if latest == nil {
+		return 0, false, nil
+	}
+	return *latest, true, nil
+}
+
 func (s *PatternStore) Close() {
 	s.db.Close()
 }
@@ -4,57 +4,128 @@ import (
 	"bytes"
 	"encoding/json"
 	"fmt"
-	"io"
 	"log"
 	"mime/multipart"
 	"net/http"
 	"os"
 	"path/filepath"
+	"sync"
 	"time"
 )
 
+// discordQueueSize bounds pending webhook posts; beyond it messages are dropped
+// rather than blocking the trading path.
+const discordQueueSize = 64
+
+// discordMessage carries the image bytes rather than its path: the chart file
+// is rewritten every bar, so a backlogged post must not read it later.
+type discordMessage struct {
+	webhookURL string
+	content    string
+	imageName  string
+	image      []byte
+}
+
 type DiscordClient struct {
 	OrderWebhookURL    string
 	PipelineWebhookURL string
 	Client             *http.Client
+
+	// mu guards closed and every send on queue, so Close can close the
+	// channel without racing a producer.
+	mu     sync.Mutex
+	closed bool
+	queue  chan discordMessage
+	wg     sync.WaitGroup
 }
 
-// NewDiscordClient sets up the webhook sender
+// NewDiscordClient sets up the webhook sender and starts its background worker.
+// Call Close on shutdown to flush pending messages.
 func NewDiscordClient(orderURL, pipelineURL string) *DiscordClient {
-	return &DiscordClient{
+	d := &DiscordClient{
 		OrderWebhookURL:    orderURL,
 		PipelineWebhookURL: pipelineURL,
 		Client:             &http.Client{Timeout: 10 * time.Second},
+		queue:              make(chan discordMessage, discordQueueSize),
 	}
+	d.wg.Add(1)
+	go d.worker()
+	return d
 }
 
 // NotifyOrder sends to the Order Room
 func (d *DiscordClient) NotifyOrder(msg string, imagePath string) {
-	d.send(d.OrderWebhookURL, "**TRADE ALERT**\n"+msg, imagePath)
+	d.enqueue(d.OrderWebhookURL, "**TRADE ALERT**\n"+msg, imagePath)
 }
 
 // NotifyPipeline sends to the Pipeline Room
 func (d *DiscordClient) NotifyPipeline(msg string, imagePath string) {
-	d.send(d.PipelineWebhookURL, msg, imagePath)
+	d.enqueue(d.PipelineWebhookURL, msg, imagePath)
 }
 
-// send handles the Logic: Text Only vs Text + Image
-func (d *DiscordClient) send(webhookURL, content string, imagePath string) {
+// Close stops accepting messages and waits until the queued ones are sent.
+func (d *DiscordClient) Close() {
+	d.mu.Lock()
+	if !d.closed {
+		d.closed = true
+		close(d.queue)
+	}
+	d.mu.Unlock()
+	d.wg.Wait()
+}
+
+// enqueue hands the message to the worker so callers never wait on Discord.
+// The image is read here, while the file still holds this bar's chart.
+func (d *DiscordClient) enqueue(webhookURL, content, imagePath string) {
 	if webhookURL == "" {
 		return
 	}
+	msg := discordMessage{webhookURL: webhookURL, content: content}
+	if imagePath != "" {
+		image, err := os.ReadFile(imagePath)
+		if err != nil {
+			log.Printf("⚠️ Webhook Image Failed (%s): %v. Fallback to text.", imagePath, err)
+		} else {
+			msg.imageName = filepath.Base(imagePath)
+			msg.image = image
+		}
+	}
 
+	d.mu.Lock()
+	defer d.mu.Unlock()
+	if d.closed {
+		log.Printf("⚠️ Webhook dropped, notifier closed")
+		return
+	}
+	select {
+	case d.queue <- msg:
+	default:
+		log.Printf("⚠️ Webhook dropped, queue full (%d)", discordQueueSize)
+	}
+}
+
+// worker posts queued messages one at a time, keeping their order, until
+// Close closes the queue and the remaining messages are drained.
+func (d *DiscordClient) worker() {
+	defer d.wg.Done()
+	for msg := range d.queue {
+		d.send(msg)
+	}
+}
+
+// send handles the Logic: Text Only vs Text + Image
+func (d *DiscordClient) send(msg discordMessage) {
 	// 1. If NO Image, send simple JSON
-	if imagePath == "" {
-		d.sendSimpleText(webhookURL, content)
+	if msg.image == nil {
+		d.sendSimpleText(msg.webhookURL, msg.content)
 		return
 	}
 
 	// 2. If Image Exists, send Multipart Request
-	err := d.sendMultipart(webhookURL, content, imagePath)
+	err := d.sendMultipart(msg.webhookURL, msg.content, msg.imageName, msg.image)
 	if err != nil {
-		log.Printf("⚠️ Webhook Image Failed (%s): %v. Fallback to text.", imagePath, err)
-		d.sendSimpleText(webhookURL, content) // Fallback
+		log.Printf("⚠️ Webhook Image Failed (%s): %v. Fallback to text.", msg.imageName, err)
+		d.sendSimpleText(msg.webhookURL, msg.content) // Fallback
 	}
 }
 
@@ -72,24 +143,17 @@ func (d *DiscordClient) sendSimpleText(url, content string) {
 }
 
 // sendMultipart handles File Upload + Content
-func (d *DiscordClient) sendMultipart(url, content, path string) error {
-	// Open file
-	file, err := os.Open(path)
-	if err != nil {
-		return err
-	}
-	defer file.Close()
-
+func (d *DiscordClient) sendMultipart(url, content, name string, image []byte) error {
 	// Prepare Body
 	body := &bytes.Buffer{}
 	writer := multipart.NewWriter(body)
 
 	// A. Add the File field ("file" is Discord's requirement)
-	part, err := writer.CreateFormFile("file", filepath.Base(path))
+	part, err := writer.CreateFormFile("file", name)
 	if err != nil {
 		return err
 	}
-	_, err = io.Copy(part, file)
+	_, err = part.Write(image)
 	if err != nil {
 		return err
 	}